@@ -0,0 +1,182 @@
+"""
+Answer Bank
+===========
+Question → answer store shared by apply_jobs.py, extract_questions.py and intercept_api.py.
+
+company_questions.json stays the snapshot format ({question: {type, options, answer}}).
+New answers are appended to a JSONL journal next to it instead of rewriting the whole
+file, and the journal is folded back into the snapshot (temp file + os.replace) every
+COMPACT_EVERY answers and on close(). A crash loses at most a half-written journal
+line, never the bank.
+
+Several processes may hold the bank at once (a run plus extract_questions.py, say).
+Appends and compaction take an exclusive lock on a .lock file next to the snapshot,
+and compaction folds the journal into the snapshot as it is on disk, not into this
+process's copy, so answers another process wrote in between are kept. An empty
+answer (a question captured without one) never replaces a non-empty one, in memory,
+on disk or when the journal is replayed.
+
+persist=False reads the bank as usual but keeps every later change in memory only
+(offline replays must neither depend on nor alter the production bank).
+"""
+import contextlib
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from rich.console import Console
+
+console = Console()
+
+QUESTIONS_FILE = "automaton/company_questions.json"
+COMPACT_EVERY = 25
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Exclusive lock across processes, held while the block runs (blocks until free)."""
+    with open(path, "a+") as f:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                f.seek(0)
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10s itself
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _read_journal(path: str, entries: Dict[str, Dict]) -> Tuple[int, bool]:
+    """Apply a journal's lines onto entries; (lines read, whether a torn line was skipped)."""
+    count, torn = 0, False
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    torn = True  # half-written last line from a crash mid-append
+                    continue
+                old = entries.get(rec["question"])
+                if not rec["answer"] and old and old.get("answer"):
+                    continue  # captured without an answer by a process that hadn't seen it answered
+                entries[rec["question"]] = {k: rec[k] for k in ("type", "options", "answer")}
+                count += 1
+    return count, torn
+
+
+class AnswerBank:
+    def __init__(self, path: str = QUESTIONS_FILE, compact_every: int = COMPACT_EVERY, persist: bool = True):
+        self.path = path
+        self.persist = persist
+        self.journal_path = os.path.splitext(path)[0] + ".journal.jsonl"
+        self.lock_path = path + ".lock"
+        self.compact_every = compact_every
+        self.entries: Dict[str, Dict] = {}
+        self._pending = 0
+        self._snapshot_ok = True
+        self._load()
+
+    def _load(self) -> None:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                # Never compact over a snapshot we couldn't read — answers keep going to the journal
+                self._snapshot_ok = False
+                console.print(f"[red]Failed to load JSON answers: {e}[/red]")
+
+        self._pending, torn = _read_journal(self.journal_path, self.entries)
+        if torn:
+            # Fold in what survived now, so new lines aren't appended onto the torn one
+            self.compact()
+
+    def __contains__(self, q_text: str) -> bool:
+        return q_text in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, q_text: str) -> Optional[Dict]:
+        return self.entries.get(q_text)
+
+    def questions(self) -> Set[str]:
+        return set(self.entries)
+
+    def answers(self) -> Dict[str, str]:
+        """The load_answers contract: question text → non-empty answer string."""
+        return {q: d["answer"] for q, d in self.entries.items() if d.get("answer")}
+
+    def types(self) -> Dict[str, str]:
+        """Question text → question type, for QuestionIndex's similar-tier type check."""
+        return {q: d.get("type", "") for q, d in self.entries.items()}
+
+    def add(self, q_text: str, q_type: str, answer: str = "", options: Optional[List[str]] = None) -> None:
+        """Record (or overwrite) one question; durable once this returns. An empty answer doesn't replace a saved one."""
+        old = self.entries.get(q_text)
+        if not answer and old and old.get("answer"):
+            return
+        entry = {"type": q_type, "options": options or [], "answer": answer}
+        self.entries[q_text] = entry
+        if not self.persist:
+            return
+        with _file_lock(self.lock_path), open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"question": q_text, **entry}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Fold the journal into the snapshot on disk (temp file + os.replace), then drop
+        the journal. Both are re-read under the lock, so nothing another process
+        appended or compacted is lost; this process's copy is refreshed from the result.
+        """
+        if not self._snapshot_ok or not self.persist:
+            return
+        with _file_lock(self.lock_path):
+            merged: Dict[str, Dict] = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        merged = json.load(f)
+                except Exception as e:
+                    console.print(f"[red]Not compacting answers: snapshot unreadable ({e})[/red]")
+                    return
+            _read_journal(self.journal_path, merged)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(merged, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            # Replaying a journal that survived a crash right here is harmless: same entries.
+            # No one can append while the lock is held, so every line removed was folded in.
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        self.entries = merged
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._pending:
+            self.compact()
+
+
+def load_answers(path: str = QUESTIONS_FILE) -> Dict[str, str]:
+    return AnswerBank(path).answers()
@@ -0,0 +1,226 @@
+"""
+Answer Rules
+============
+Resolves numeric-range questions (years of experience, expected salary, notice period)
+from the user's profile instead of a stored answer or a prompt.
+
+Each rule names the questions it handles (a regex over the question text), the units
+its option labels may use, and the profile value to compare with. Option labels are
+parsed into ranges:
+
+  "No experience" / "Tidak ada pengalaman"   → 0
+  "Less than 1 year" / "Kurang dari 1 tahun" → [0, 1)
+  "1 - 2 years", "2 tahun"                   → [1, 2], 2
+  "More than 5 years", "5+ years"            → (5, ∞)
+  "Rp 5 Jt", "Rp 1.5 million", "Rp 5,000,000", "Rp 100 million or more"
+
+and the option whose range holds the profile value wins (the narrowest one if several
+do). If none does, the rule's fallback picks one: floor (years: don't claim more than
+you have), ceil (notice: don't promise less) or nearest (salary). Options that don't
+parse ("I prefer not to say") are left out; a rule needs at least two parsed options.
+
+The profile lives in automaton/profile.json; years_by_role overrides
+years_experience when the question names the role ("...as a Librarian?").
+
+  python automaton/answer_rules.py    # check the label forms above still parse
+"""
+import json
+import math
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+PROFILE_FILE = "automaton/profile.json"
+DEFAULT_PROFILE = {
+    "years_experience": 1,
+    "years_by_role": {},
+    "expected_salary_idr": 5000000,
+    "notice_months": 0,
+}
+
+
+class Rule(NamedTuple):
+    name: str
+    question: re.Pattern
+    units: Dict[str, float]     # unit word → multiplier into the rule's base unit
+    zero: Tuple[str, ...]       # labels meaning 0 ("No experience")
+    profile_key: str
+    fallback: str               # "floor" | "ceil" | "nearest"
+    unit_required: bool = True  # bare numbers don't count (years, months)
+
+
+class OptionRange(NamedTuple):
+    label: str
+    low: float
+    high: float
+    low_open: bool = False
+    high_open: bool = False
+
+    def contains(self, v: float) -> bool:
+        above = v > self.low if self.low_open else v >= self.low
+        below = v < self.high if self.high_open else v <= self.high
+        return above and below
+
+
+class RuleAnswer(NamedTuple):
+    rule: str
+    answer: str   # the option label to select
+    value: float  # the profile value it was chosen for
+
+
+_YEAR_UNITS = {"year": 1.0, "years": 1.0, "yr": 1.0, "yrs": 1.0, "tahun": 1.0,
+               "month": 1 / 12, "months": 1 / 12, "bulan": 1 / 12}
+_MONTH_UNITS = {"month": 1.0, "months": 1.0, "bulan": 1.0, "week": 0.25, "weeks": 0.25, "minggu": 0.25,
+                "year": 12.0, "years": 12.0, "tahun": 12.0}
+_IDR_UNITS = {"jt": 1e6, "juta": 1e6, "million": 1e6, "mio": 1e6, "m": 1e6,
+              "rb": 1e3, "ribu": 1e3, "k": 1e3, "thousand": 1e3}
+
+# Most specific first: "Berapa lama ... memberi tahu perusahaanmu" is a notice question
+RULES = [
+    Rule("notice", re.compile(r"notice|memberi tahu|pemberitahuan", re.I), _MONTH_UNITS,
+         ("none", "tidak ada", "ready to go now", "segera", "immediately"), "notice_months", "ceil"),
+    Rule("years", re.compile(r"how many years|years'? (?:of )?experience|berapa tahun|tahun pengalaman|lama pengalaman", re.I),
+         _YEAR_UNITS, ("no experience", "tidak ada pengalaman", "belum ada pengalaman", "none"), "years_experience", "floor"),
+    Rule("salary", re.compile(r"salary|gaji|upah|income|penghasilan|remunera", re.I), _IDR_UNITS,
+         (), "expected_salary_idr", "nearest", unit_required=False),
+]
+
+_LESS = re.compile(r"less than|kurang dari|under|below|di ?bawah|<", re.I)
+_MORE = re.compile(r"more than|lebih dari|over|above|di ?atas|>", re.I)
+_OR_MORE = re.compile(r"or more|atau lebih|and above|ke ?atas|\+", re.I)
+# "5+ years": the "+" may sit between a number and its unit
+_AMOUNT = re.compile(r"(\d+(?:[.,]\d+)*)\s*(?:\+\s*)?([a-z]+)?", re.I)
+
+
+def parse_number(token: str, multiplier: float = 1.0) -> float:
+    """'5,000,000' / '5.000.000' → 5000000, '1.5' / '1,5' → 1.5."""
+    parts = re.split(r"[.,]", token)
+    if len(parts) > 1 and all(len(p) == 3 for p in parts[1:]) and not (multiplier >= 1e6 and len(parts) == 2):
+        return float("".join(parts))
+    return float(parts[0] + ("." + "".join(parts[1:]) if len(parts) > 1 else ""))
+
+
+def parse_option(label: str, rule: Rule) -> Optional[OptionRange]:
+    """The numeric range an option label stands for, in the rule's base unit, or None."""
+    text = " ".join(label.lower().split())
+    if any(text.startswith(z) for z in rule.zero):
+        return OptionRange(label, 0.0, 0.0)
+
+    # (number, unit) pairs; a bare number takes the unit of the next one ("1 - 2 years")
+    found = []
+    for m in _AMOUNT.finditer(text):
+        unit = (m.group(2) or "").lower()
+        found.append([m.group(1), unit if unit in rule.units else ""])
+    for i in range(len(found) - 2, -1, -1):
+        if not found[i][1]:
+            found[i][1] = found[i + 1][1]
+    if rule.unit_required:
+        found = [f for f in found if f[1]]
+    if not found or len(found) > 2:
+        return None
+    values = [parse_number(num, rule.units.get(unit, 1.0)) * rule.units.get(unit, 1.0) for num, unit in found]
+
+    if len(values) == 2:
+        return OptionRange(label, min(values), max(values))
+    v = values[0]
+    if _LESS.search(text):
+        return OptionRange(label, 0.0, v, high_open=True)
+    if _OR_MORE.search(text):
+        return OptionRange(label, v, math.inf)
+    if _MORE.search(text):
+        return OptionRange(label, v, math.inf, low_open=True)
+    return OptionRange(label, v, v)
+
+
+def choose(ranges: List[OptionRange], value: float, fallback: str) -> OptionRange:
+    holding = [r for r in ranges if r.contains(value)]
+    if holding:
+        return min(holding, key=lambda r: r.high - r.low)
+    if fallback == "floor":
+        below = [r for r in ranges if r.high <= value]
+        return max(below, key=lambda r: r.high) if below else min(ranges, key=lambda r: r.low)
+    if fallback == "ceil":
+        above = [r for r in ranges if r.low >= value]
+        return min(above, key=lambda r: r.low) if above else max(ranges, key=lambda r: r.high)
+    return min(ranges, key=lambda r: max(r.low - value, value - r.high, 0.0))
+
+
+def load_profile(path: str = PROFILE_FILE) -> Dict:
+    profile = dict(DEFAULT_PROFILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            profile.update(json.load(f))
+    return profile
+
+
+def _profile_value(rule: Rule, q_text: str, profile: Dict) -> float:
+    if rule.name == "years":
+        q_lower = q_text.lower()
+        for role in sorted(profile.get("years_by_role", {}), key=len, reverse=True):
+            if role.lower() in q_lower:
+                return float(profile["years_by_role"][role])
+    return float(profile[rule.profile_key])
+
+
+def rule_answer(q_text: str, q_type: str, options: List[str], profile: Optional[Dict] = None) -> Optional[RuleAnswer]:
+    """The option a rule picks for a Dropdown/Choice question, or None if no rule applies."""
+    if q_type not in ("Dropdown", "Choice") or len(options) < 2:
+        return None
+    profile = profile if profile is not None else get_profile()
+    for rule in RULES:
+        if not rule.question.search(q_text):
+            continue
+        ranges = [r for r in (parse_option(o, rule) for o in options) if r is not None]
+        if len(ranges) < 2:
+            continue
+        value = _profile_value(rule, q_text, profile)
+        return RuleAnswer(rule.name, choose(ranges, value, rule.fallback).label, value)
+    return None
+
+
+_profile: Optional[Dict] = None
+
+
+def get_profile() -> Dict:
+    """Process-wide profile, read on first use."""
+    global _profile
+    if _profile is None:
+        _profile = load_profile()
+    return _profile
+
+
+# The label forms the module docstring promises: (rule, label, low, high, low_open, high_open)
+_LABEL_EXAMPLES = [
+    ("years", "No experience", 0, 0, False, False),
+    ("years", "Tidak ada pengalaman", 0, 0, False, False),
+    ("years", "Less than 1 year", 0, 1, False, True),
+    ("years", "Kurang dari 1 tahun", 0, 1, False, True),
+    ("years", "1 - 2 years", 1, 2, False, False),
+    ("years", "2 tahun", 2, 2, False, False),
+    ("years", "More than 5 years", 5, math.inf, True, False),
+    ("years", "5+ years", 5, math.inf, False, False),
+    ("salary", "Rp 5 Jt", 5e6, 5e6, False, False),
+    ("salary", "Rp 1.5 million", 1.5e6, 1.5e6, False, False),
+    ("salary", "Rp 5,000,000", 5e6, 5e6, False, False),
+    ("salary", "Rp 100 million or more", 1e8, math.inf, False, False),
+]
+
+
+def check_examples() -> List[str]:
+    """Labels from _LABEL_EXAMPLES that no longer parse as documented."""
+    rules = {r.name: r for r in RULES}
+    failures = []
+    for name, label, *want in _LABEL_EXAMPLES:
+        got = parse_option(label, rules[name])
+        if got is None or list(got[1:]) != want:
+            failures.append(f"{name}: {label!r} → {got}")
+    return failures
+
+
+if __name__ == "__main__":
+    import sys
+    failed = check_examples()
+    for line in failed:
+        print(f"FAIL {line}")
+    print(f"{len(_LABEL_EXAMPLES) - len(failed)}/{len(_LABEL_EXAMPLES)} label forms parse as documented")
+    sys.exit(1 if failed else 0)
@@ -1,41 +1,234 @@
+"""
+JobStreet Search API Client
+===========================
+Discovers jobs through the JSON endpoint the SERP itself calls
+(/api/chalice-search/v4/search) instead of paging the SERP in Chromium. One pooled
+requests.Session carries the logged-in cookies, either taken from the running
+Playwright context or from an exported cookie file, and each page of results comes
+back as normalized records with the same keys harvest_job_cards() produces, so
+apply_jobs.py can filter and open them exactly like SERP cards.
+
+Raw pages can be recorded and replayed by a local stub server, so the client (and
+apply_jobs.py --discovery api) can be exercised offline:
+
+  python automaton/api_fetcher.py search <keyword> [location] [--pages N] [--record DIR]
+  python automaton/api_fetcher.py serve DIR [port]
+  python automaton/api_fetcher.py search guru Jakarta --base http://127.0.0.1:8765
+"""
 import json
-import requests
+import os
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+COOKIE_FILE = "app/config/jobstreet-cookie.json"
+API_BASE_URL = os.environ.get("JOBSTREET_API_BASE", "https://id.jobstreet.com")
+SEARCH_PATH = "/api/chalice-search/v4/search"
+SITE_KEY = "ID-Main"
+PAGE_SIZE = 32
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
 
 def parse_cookies(cookie_file):
     with open(cookie_file, 'r', encoding='utf-8') as f:
         cookie_data = json.load(f)
-    
+
     # Simple cookie string builder
     cookies = {}
     for c in cookie_data:
         cookies[c['name']] = c['value']
     return cookies
 
-def fetch_questionnaire(job_id, cookies=None):
-    # This URL is an example GraphQL endpoint structure often found in Seek/Jobstreet
-    # Needs reverse-engineering the exact request payload and endpoint, 
-    # but the approach remains the same:
-    print("Testing Jobstreet GraphQL API for job questionnaire...")
-    
-    url = "https://id.jobstreet.com/api/chalice-search/v4/search"
-    
-    # We will need a specific job URL to inspect first. For now, since we're just
-    # establishing the method, we'll write the stub to show we can use the cookie.
-    
-    # In a real run, we'd hit the job details API or the application API:
-    # URL = f"https://api.seek.com/jobposting/{job_id}/apply"
-    
-    print("Since we don't have the exact private API schema yet,")
-    print("This script is ready to use the cookie to fetch user-authenticated pages.")
-    
-    # Example usage:
-    # response = requests.get('https://id.jobstreet.com/api/chalice-search/v4/search', cookies=cookies, headers={'User-Agent': 'Mozilla/5.0'})
-    # print(response.status_code)
 
-if __name__ == "__main__":
-    cookie_file = "app/config/jobstreet-cookie.json"
-    cookies = parse_cookies(cookie_file)
-    print(f"Loaded {len(cookies)} cookies from {cookie_file}")
-    print("Ready to authenticate using provided cookies!")
+def cookies_from_context(context_cookies: List[Dict]) -> Dict[str, str]:
+    """name → value for the JobStreet/SEEK cookies of a Playwright context.cookies() list."""
+    return {c["name"]: c["value"] for c in context_cookies
+            if "jobstreet" in c.get("domain", "") or "seek" in c.get("domain", "")}
+
+
+def _first(raw: Dict, *keys):
+    """First non-empty value among keys — field names differ between v4 response versions."""
+    for key in keys:
+        value = raw.get(key)
+        if value not in (None, "", []):
+            return value
+    return None
+
+
+def normalize_job(raw: Dict) -> Dict:
+    """One search hit → the card shape harvest_job_cards() returns, plus the teaser."""
+    job_id = str(raw.get("id", ""))
+
+    location = _first(raw, "location", "suburb", "area")
+    if not location and raw.get("locations"):
+        location = ", ".join(loc.get("label", "") for loc in raw["locations"] if loc.get("label"))
+    salary = _first(raw, "salaryLabel", "salary")
+    if isinstance(salary, dict):
+        salary = salary.get("label", "")
+
+    return {
+        "job_id": job_id,
+        "href": f"/id/job/{job_id}",
+        "title": (raw.get("title") or "").strip(),
+        "location": location or "",
+        "salary": salary or "",
+        "listed": _first(raw, "listingDateDisplay", "listingDate") or "",
+        "quick_apply": bool(_first(raw, "isQuickApply", "quickApply")),
+        # Link-out adverts apply on the employer's site; the card filter skips them
+        "external": bool(_first(raw, "isLinkOut", "linkOut")),
+        "teaser": (raw.get("teaser") or "").strip(),
+    }
+
+
+class JobSearchClient:
+    def __init__(self, cookies: Optional[Dict[str, str]] = None, base_url: str = API_BASE_URL,
+                 page_size: int = PAGE_SIZE, timeout: float = 15.0, record_dir: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.timeout = timeout
+        self.record_dir = record_dir
+        self.requests_made = 0
 
+        # One keep-alive pool for every page; transient 429/5xx are retried with backoff
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+            "Accept-Language": "id-ID,id;q=0.9,en;q=0.8",
+            "Referer": f"{self.base_url}/",
+        })
+        if cookies:
+            self.session.cookies.update(cookies)
+
+    @classmethod
+    def from_cookie_file(cls, cookie_file: str = COOKIE_FILE, **kwargs) -> "JobSearchClient":
+        return cls(parse_cookies(cookie_file), **kwargs)
+
+    def search_page(self, keyword: str, location: str = "", page: int = 1) -> Tuple[List[Dict], int]:
+        """One page of results as (normalized jobs, total hit count)."""
+        params = {
+            "siteKey": SITE_KEY,
+            "sourcesystem": "houston",
+            "keywords": keyword,
+            "where": location,
+            "page": page,
+            "pageSize": self.page_size,
+            "locale": "id-ID",
+        }
+        resp = self.session.get(self.base_url + SEARCH_PATH, params=params, timeout=self.timeout)
+        self.requests_made += 1
+        resp.raise_for_status()
+        data = resp.json()
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+            with open(os.path.join(self.record_dir, f"page_{page}.json"), "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+
+        jobs = [normalize_job(raw) for raw in data.get("data") or [] if raw.get("id")]
+        total = data.get("totalCount") or data.get("total") or 0
+        return jobs, int(total)
+
+    def search(self, keyword: str, location: str = "", max_pages: Optional[int] = None) -> Iterator[Dict]:
+        """Every job for a query, page after page, each job id once."""
+        seen = set()
+        page = 1
+        while max_pages is None or page <= max_pages:
+            jobs, total = self.search_page(keyword, location, page)
+            if not jobs:
+                return
+            for job in jobs:
+                if job["job_id"] not in seen:
+                    seen.add(job["job_id"])
+                    yield job
+            if page * self.page_size >= total:
+                return
+            page += 1
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# ---------------------------------------------------------------------------
+# Replay stub: serves page_<n>.json recordings on SEARCH_PATH
+# ---------------------------------------------------------------------------
+
+def start_stub_server(directory: str, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve recorded pages from a daemon thread; returns (server, base_url)."""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != SEARCH_PATH:
+                self.send_error(404)
+                return
+            page = parse_qs(url.query).get("page", ["1"])[0]
+            path = os.path.join(directory, f"page_{page}.json")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    body = f.read()
+            else:
+                # Past the last recording: an empty page ends the client's paging
+                body = json.dumps({"data": [], "totalCount": 0}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), ReplayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _pop_flag(args: List[str], flag: str) -> Optional[str]:
+    if flag in args:
+        i = args.index(flag)
+        value = args[i + 1]
+        del args[i:i + 2]
+        return value
+    return None
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["serve"] and len(args) > 1:
+        port = int(args[2]) if len(args) > 2 else 8765
+        server, base = start_stub_server(args[1], port)
+        print(f"Replaying {args[1]} on {base}{SEARCH_PATH} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args[:1] == ["search"] and len(args) > 1:
+        pages = _pop_flag(args, "--pages")
+        record_dir = _pop_flag(args, "--record")
+        base = _pop_flag(args, "--base") or API_BASE_URL
+        keyword = args[1]
+        location = args[2] if len(args) > 2 else ""
+        cookies = parse_cookies(COOKIE_FILE) if os.path.exists(COOKIE_FILE) else None
+        client = JobSearchClient(cookies, base_url=base, record_dir=record_dir)
+        t0 = time.monotonic()
+        jobs = list(client.search(keyword, location, int(pages) if pages else None))
+        elapsed = time.monotonic() - t0
+        for job in jobs:
+            print(f"{job['job_id']:>10}  {job['title'][:60]:<60}  {job['location']}")
+        print(f"{len(jobs)} jobs from {client.requests_made} requests in {elapsed:.2f}s")
+        client.close()
+    else:
+        print(__doc__)
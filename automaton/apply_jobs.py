@@ -14,23 +14,44 @@ How to use:
   Your existing login session is loaded automatically from your Chrome profile.
 """
 import asyncio
+import functools
 import re
 import os
-from typing import Set, Dict, Optional, List
+import time
+import urllib.parse
+from typing import AsyncIterator, Set, Dict, Optional, List, Tuple
 from playwright.async_api import async_playwright, BrowserContext, Page
 from rich.console import Console
 from rich.prompt import Prompt
 
-console = Console()
-
-import json
+from answer_bank import AnswerBank, QUESTIONS_FILE
+from checkpoint import CHECKPOINT_FILE, Checkpoint, settings_key
+from api_fetcher import JobSearchClient, cookies_from_context
+from answer_rules import RuleAnswer, rule_answer
+from history_store import HistoryStore
+from job_cache import APPLY_EXTERNAL, APPLY_EXTERNAL_SITE, APPLY_INTERNAL, APPLY_NONE, JobCache
+from network_policy import NetworkPolicy
+from pending_queue import PARK_MAX_ATTEMPTS, PendingQueue
+from query_scheduler import SearchQuery, parse_queries, round_robin, yield_table
+from question_index import QuestionIndex
+from run_logger import RunLogger
+from session_check import SESSION_STATE_FILE, check_session, load_reference
+from stage_timer import TIMER
 
-QUESTIONS_FILE = "automaton/company_questions.json"
-APPLIED_JOBS_FILE = "automaton/applied_job.md"
+console = Console()
 
 # Dedicated profile dir for this automation — session is saved after first login
 PLAYWRIGHT_PROFILE = os.path.join(os.path.dirname(__file__), "playwright-profile")
 
+# Number of job detail pages prefetched and filtered in parallel while the form stage runs
+EVAL_CONCURRENCY = 3
+
+# Recommendation mode: first wait after a homepage refresh with no new jobs, doubled
+# per further empty refresh up to the cap; the run ends after REC_MAX_STALE in a row
+REC_BACKOFF_BASE = 2.0
+REC_BACKOFF_MAX = 30.0
+REC_MAX_STALE = 5
+
 # Whole-word exclusion keywords — avoids false matches like 'art' in 'Elementary'
 KEYWORDS_TO_EXCLUDE = [
     "mandarin", "chinese", "japanese", "german", "religous", "agama",
@@ -42,92 +63,122 @@ KEYWORDS_TO_EXCLUDE = [
 # ---------------------------------------------------------------------------
 
 
-def load_applied_jobs() -> Set[str]:
-    applied_urls: Set[str] = set()
-    if not os.path.exists(APPLIED_JOBS_FILE):
-        return applied_urls
-    with open(APPLIED_JOBS_FILE, "r", encoding="utf-8") as f:
-        content = f.read()
-    for match in re.finditer(r"\[.*?\]\((.*?)\)", content):
-        applied_urls.add(match.group(1).split("?")[0])
-    return applied_urls
+_answer_bank: Optional[AnswerBank] = None
 
 
-def log_applied_job(title: str, url: str, salary: str, location: str, is_dry_run: bool) -> None:
-    try:
-        is_new = not os.path.exists(APPLIED_JOBS_FILE)
-        with open(APPLIED_JOBS_FILE, "a", encoding="utf-8") as f:
-            if is_new:
-                f.write("# Applied Jobs History\n\n| Job Title | Location | Salary | Link |\n|---|---|---|---|\n")
-            tag = " (DRY RUN)" if is_dry_run else ""
-            clean_url = url.split("?")[0]
-            f.write(f"| {title}{tag} | {location} | {salary} | [Link]({clean_url}) |\n")
-    except Exception as e:
-        console.print(f"[red]Failed to log: {e}[/red]")
+def get_answer_bank() -> AnswerBank:
+    """Process-wide answer bank, opened on first use (journal replayed, see answer_bank.py)."""
+    global _answer_bank
+    if _answer_bank is None:
+        _answer_bank = AnswerBank(QUESTIONS_FILE)
+    return _answer_bank
 
 
 def load_answers() -> Dict[str, str]:
-    if not os.path.exists(QUESTIONS_FILE):
-        return {}
-    try:
-        with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        # For apply logic, we only strictly need the 'answer' string mapped by question text
-        return {q: d["answer"] for q, d in data.items() if "answer" in d and d["answer"]}
-    except Exception as e:
-        console.print(f"[red]Failed to load JSON answers: {e}[/red]")
-        return {}
+    # For apply logic, we only strictly need the 'answer' string mapped by question text
+    return get_answer_bank().answers()
 
 
 def append_question(q_text: str, q_type: str, answer: str = "", options: Optional[List[str]] = None) -> None:
-    data = {}
-    if os.path.exists(QUESTIONS_FILE):
-        try:
-            with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
-            pass
-            
-    data[q_text] = {
-        "type": q_type,
-        "options": options or [],
-        "answer": answer
-    }
-    
-    with open(QUESTIONS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    get_answer_bank().add(q_text, q_type, answer, options)
+
+
+# Broaden 'guru' to its common English/Indo equivalents so we don't accidentally skip good matches
+GURU_SYNONYMS = ["guru", "teacher", "tutor", "pengajar", "lecturer", "educator", "dosen", "pendidik", "instructor", "fasilitator"]
+
+
+class ExclusionMatcher:
+    """
+    is_job_valid's rules compiled once per run.
+
+    Keywords are normalized and deduplicated, then folded into one alternation:
+    plain keywords share a single pair of word-boundary anchors (longest first, so
+    'christiann' wins over 'christian') and regex entries like the built-in 'art'
+    one are appended as-is. Groups are non-capturing on purpose — one named group
+    per keyword made CPython's re slower than the per-keyword loop it replaces.
+    """
+
+    def __init__(self, exclude_list: List[str], search_keyword: str = ""):
+        keywords: List[str] = []
+        for kw in exclude_list:
+            kw = kw.strip()
+            if not kw:
+                continue
+            if not kw.startswith(r"\b"):
+                kw = " ".join(kw.lower().split())
+            keywords.append(kw)
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        self._plain: Set[str] = {kw for kw in self.keywords if not kw.startswith(r"\b")}
+        self._raw: List[re.Pattern] = [re.compile(kw) for kw in self.keywords if kw.startswith(r"\b")]
+
+        alternatives = []
+        if self._plain:
+            words = sorted(self._plain, key=len, reverse=True)
+            alternatives.append(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\b")
+        alternatives += [f"(?:{p.pattern})" for p in self._raw]
+        self._exclude_re = re.compile("|".join(alternatives)) if alternatives else None
+
+        self.search_keyword = search_keyword.strip().lower()
+        words = GURU_SYNONYMS if "guru" in self.search_keyword else self.search_keyword.split()
+        self._title_re = re.compile("|".join(re.escape(w) for w in words)) if words else None
+
+    def excluded_keyword(self, text: str) -> str:
+        """Return the exclusion keyword found first in text (already lower-cased), or ''."""
+        if self._exclude_re is None:
+            return ""
+        m = self._exclude_re.search(text)
+        if not m:
+            return ""
+        hit = m.group()
+        if hit in self._plain:
+            return hit
+        for p in self._raw:
+            if p.fullmatch(hit):
+                return p.pattern
+        return hit
+
+    def check(self, title: str, description: str = "") -> Tuple[bool, str]:
+        """Same verdict as is_job_valid: (True, '') or (False, matched keyword / drift reason)."""
+        kw = self.excluded_keyword(f"{title} {description}".lower())
+        if kw:
+            return False, kw
+
+        # Enforce search keyword inclusion in title (to combat JobStreet recommendation drift)
+        if self._title_re is not None and not self._title_re.search(title.lower()):
+            return False, f"drifted missing {self.search_keyword}"
+        return True, ""
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_matcher(exclude: Tuple[str, ...], search_keyword: str) -> ExclusionMatcher:
+    return ExclusionMatcher(list(exclude), search_keyword)
 
 
 def is_job_valid(title: str, description: str, exclude_list: List[str], search_keyword: str = "") -> Tuple[bool, str]:
     """Whole-word keyword check and positive title match to prevent drift."""
-    text = f"{title} {description}".lower()
-    
-    # 1. Check exclusions
-    for kw in exclude_list:
-        kw = kw.strip()
-        if not kw:
-            continue
-        pattern = kw if kw.startswith(r"\b") else rf"\b{re.escape(kw)}\b"
-        if re.search(pattern, text):
-            return False, kw
+    return _cached_matcher(tuple(exclude_list), search_keyword).check(title, description)
 
-    # 2. Enforce search keyword inclusion in title (to combat JobStreet recommendation drift)
-    if search_keyword and search_keyword.strip():
-        k_low = search_keyword.strip().lower()
-        t_low = title.lower()
-        
-        # Broaden 'guru' to its common English/Indo equivalents so we don't accidentally skip good matches
-        if "guru" in k_low:
-            valid_words = ["guru", "teacher", "tutor", "pengajar", "lecturer", "educator", "dosen", "pendidik", "instructor", "fasilitator"]
-            if not any(w in t_low for w in valid_words):
-                return False, f"drifted missing {k_low}"
-        else:
-            # General keyword check: at least one word from the search query MUST be in the title
-            words = k_low.split()
-            if words and not any(w in t_low for w in words):
-                return False, f"drifted missing {k_low}"
-                
-    return True, ""
+
+def card_skip_reason(card: Dict, location: str, matcher: ExclusionMatcher, applied_history: HistoryStore) -> Tuple[str, str]:
+    """
+    Reject a job from its SERP card alone: already applied, title exclusion, location
+    shown on the card, external-apply flag. Returns (reason, keyword) like the run-log
+    skip entries, or ("", "") if the detail page is worth opening.
+    """
+    if card["job_id"] in applied_history:
+        return "already history", ""
+
+    is_valid, matched_kw = matcher.check(card["title"])
+    if not is_valid:
+        return "title filter", matched_kw
+
+    card_loc = card.get("location", "")
+    if location and card_loc and location.lower() not in card_loc.lower():
+        return "location filter", card_loc
+
+    if card.get("external"):
+        return "external application", ""
+    return "", ""
 
 # ---------------------------------------------------------------------------
 # Browser / DOM Helpers
@@ -153,25 +204,310 @@ async def safe_click(locator, retries=3, timeout=3000):
             await asyncio.sleep(1)
 
 
-async def get_question_groups(page: Page) -> list:
+# Collects every question group on the current step in a single round trip.
+# Mirrors the three per-element passes in _get_question_groups_legacy (label[for],
+# fieldset radiogroups, ID_Q/AU_Q checkbox groups) and returns plain data, so
+# fill_question_group can act on option values and input ids without re-reading the DOM.
+_QUESTION_SNAPSHOT_JS = """
+() => {
+    const text = el => (el ? (el.innerText || el.textContent || '') : '').trim();
+    const clean = s => s.replace(/\\*/g, '').trim();
+    const attr = v => '"' + CSS.escape(v) + '"';
+    const labelFor = (root, id) => root.querySelector('label[for=' + attr(id) + ']');
+    const choiceOf = (root, inp) => {
+        const lbl = labelFor(root, inp.id || '');
+        return lbl ? { id: inp.id, label: text(lbl), value: inp.value || '', checked: inp.checked } : null;
+    };
+    const groups = [];
+
+    // 1. Standard questions: label[for^='question-'] + select/input
+    for (const label of document.querySelectorAll("label[for^='question-']")) {
+        const strong = label.querySelector('strong');
+        const q = clean(text(strong || label));
+        if (q.length < 4) continue;
+        const forId = label.getAttribute('for') || '';
+        const target = forId ? document.getElementById(forId) : null;
+        let type = 'Text';
+        const choices = [];
+        if (target) {
+            const tag = target.tagName.toLowerCase();
+            if (tag === 'select') {
+                type = 'Dropdown';
+                for (const opt of target.querySelectorAll('option')) {
+                    const t = text(opt);
+                    const v = opt.getAttribute('value') || '';
+                    if (t && !t.toLowerCase().includes('pilih') && v) {
+                        choices.push({ id: forId, label: t, value: v, checked: opt.selected });
+                    }
+                }
+            } else if (tag === 'input') {
+                const inpType = target.getAttribute('type') || 'text';
+                if (inpType === 'checkbox' || inpType === 'radio') {
+                    type = 'Choice';
+                    const inputs = document.querySelectorAll(
+                        'input[id^=' + attr(forId + '_A_') + '], input[id=' + attr(forId) + ']');
+                    for (const inp of inputs) {
+                        const c = choiceOf(document, inp);
+                        if (c) choices.push(c);
+                    }
+                }
+            }
+        }
+        groups.push({ text: q, type, choices, label_for: forId, is_required: text(label).includes('*') });
+    }
+
+    // 2. React-style radio groups (fieldset carries the question id)
+    for (const fs of document.querySelectorAll("fieldset[role='radiogroup']")) {
+        const legend = fs.querySelector('legend');
+        if (!legend) continue;
+        const q = clean(text(legend));
+        if (q.length < 4) continue;
+        const choices = [];
+        for (const r of fs.querySelectorAll("input[type='radio']")) {
+            const c = choiceOf(fs, r);
+            if (c) choices.push(c);
+        }
+        groups.push({ text: q, type: 'Choice', choices, label_for: fs.id || '', is_required: text(legend).includes('*') });
+    }
+
+    // 3. Multi-choice checkbox groups (id^='ID_Q_'/'AU_Q_' without the 'question-' prefix)
+    const seen = new Set();
+    for (const inp of document.querySelectorAll("input[type='checkbox'][id^='ID_Q_'], input[type='checkbox'][id^='AU_Q_']")) {
+        const prefix = inp.id.replace(/_A_[^_]+$/, '');
+        if (seen.has(prefix)) continue;
+        seen.add(prefix);
+
+        let heading = '';
+        // Option labels share the prefix (for="ID_Q_119_V_1_A_635"); only a label for the group itself is a heading
+        const headingLabel = document.querySelector('label[for^=' + attr(prefix) + ']:not([for*="_A_"])');
+        if (headingLabel) {
+            heading = text(headingLabel);
+        } else {
+            let node = inp;
+            for (let i = 0; i < 10 && !heading; i++) {
+                node = node.parentElement;
+                if (!node) break;
+                let sib = node.previousElementSibling;
+                while (sib && !heading) {
+                    const s = sib.querySelector('strong');
+                    if (s) heading = text(s);
+                    sib = sib.previousElementSibling;
+                }
+                if (!heading) {
+                    const direct = node.querySelector(':scope > span strong, :scope > div strong');
+                    if (direct) heading = text(direct);
+                }
+            }
+        }
+
+        const choices = [];
+        for (const gi of document.querySelectorAll('input[id^=' + attr(prefix + '_A_') + ']')) {
+            const c = choiceOf(document, gi);
+            if (c) choices.push(c);
+        }
+        if (choices.length) {
+            groups.push({ text: heading || prefix, type: 'MultiChoice', choices, label_for: prefix, is_required: false });
+        }
+    }
+    return groups;
+}
+"""
+
+
+def _id_selector(element_id: str) -> str:
+    """Attribute selector for an id — React ids like ':r27:' are not valid after '#'."""
+    return f'[id="{element_id}"]'
+
+
+# Filter out utility links that share the /job/ path but aren't the job title
+IGNORE_LINK_TEXTS = ["simpan", "save", "lamaran cepat", "quick apply", "lihat semua", "see all"]
+
+# Rendered once a SERP or the homepage has job cards on it
+JOB_LIST_SELECTOR = 'article[data-automation="normalJob"], a[data-automation^="recommendedJobLink_"]'
+
+# Every a[href*="/job/"] on a SERP or the homepage, with the card metadata around it,
+# in one round trip. Python does the ignore-text and job-id dedupe (harvest_job_cards).
+_JOB_CARDS_JS = """
+() => {
+    const text = el => (el ? (el.innerText || el.textContent || '') : '').trim();
+    const all = (root, sel) => Array.from(root.querySelectorAll(sel)).map(text).filter(Boolean);
+    const cards = [];
+    for (const a of document.querySelectorAll('a[href*="/job/"]')) {
+        const href = a.getAttribute('href') || '';
+        const m = href.match(/\\/job\\/(\\d+)/);
+        if (!m) continue;
+
+        // JobStreet links often wrap the entire card or just have the title
+        const raw = text(a) || a.getAttribute('aria-label') || a.getAttribute('title') || '';
+        // SERP cards are <article>s; homepage recommendation links overlay their card
+        const card = a.closest('article')
+            || (a.matches('[data-automation^="recommendedJobLink_"]') ? a.parentElement : null);
+
+        const info = { job_id: m[1], href, title: raw.split('\\n')[0].trim(),
+                       location: '', salary: '', listed: '', quick_apply: false, external: false };
+        if (card) {
+            info.location = all(card, '[data-automation="jobLocation"]').join(', ');
+            info.salary = text(card.querySelector('[data-automation="jobSalary"]'));
+            info.listed = text(card.querySelector('[data-automation="jobListingDate"]'));
+            info.quick_apply = /lamaran cepat|quick apply/i.test(text(card));
+            info.external = !!card.querySelector('[data-automation*="external" i]')
+                || /situs perusahaan|company site/i.test(text(card));
+        }
+        cards.push(info);
+    }
+    return cards;
+}
+"""
+
+
+async def harvest_job_cards(page: Page) -> Dict[str, Dict]:
+    """
+    Collect visible job cards keyed by job id: title, href and whatever the card shows
+    inline (location, salary, listing date, quick-apply badge). The first link with a
+    usable title wins for each job id.
+    """
+    try:
+        cards = await page.evaluate(_JOB_CARDS_JS)
+    except Exception:
+        return {}
+
+    unique: Dict[str, Dict] = {}
+    for card in cards:
+        # The first line of a card is almost always the Job Title
+        title = card["title"]
+        if len(title) > 3 and title.lower() not in IGNORE_LINK_TEXTS and card["job_id"] not in unique:
+            unique[card["job_id"]] = card
+    return unique
+
+
+# How long navigate_form waits for a step to render, and for the next one after a click
+STEP_READY_MS = 3000
+STEP_CHANGE_MS = 5000
+# A step counts as rendered once its signature has held this long: briefly when it
+# has questions, longer when it has none yet (they may still be mounting)
+STEP_QUIET_MS = 150
+STEP_EMPTY_QUIET_MS = 600
+# Bounded wait for question inputs before the snapshot reads them
+QUESTION_WAIT_MS = 1000
+QUESTION_SELECTOR = "label[for^='question-'], input[type='checkbox'][id^='ID_Q_'], input[type='checkbox'][id^='AU_Q_']"
+
+# Identifies the form step on screen: a hash of the path, the question ids (with the
+# option count of each select, so one still loading its options isn't finished yet)
+# and the headings. Empty while none of those has rendered. errors counts validation
+# messages.
+_STEP_STATE_JS = """
+() => {
+    const ids = [];
+    for (const el of document.querySelectorAll(
+            "label[for^='question-'], fieldset[role='radiogroup'], "
+            + "input[type='checkbox'][id^='ID_Q_'], input[type='checkbox'][id^='AU_Q_']")) {
+        const id = el.getAttribute('for') || el.id || '';
+        const target = el.tagName === 'LABEL' && id ? document.getElementById(id) : null;
+        ids.push(target && target.tagName === 'SELECT' ? id + ':' + target.options.length : id);
+    }
+    const headings = Array.from(document.querySelectorAll('h1, h2, h3'))
+        .map(h => (h.innerText || '').trim()).filter(Boolean);
+    let signature = '';
+    if (ids.length || headings.length) {
+        const key = location.pathname + '\\n' + ids.join(',') + '\\n' + headings.join('|');
+        let h = 5381;
+        for (let i = 0; i < key.length; i++) h = ((h << 5) + h + key.charCodeAt(i)) | 0;
+        signature = (h >>> 0).toString(16);
+    }
+    const errors = document.querySelectorAll("[aria-invalid='true'], [role='alert']").length;
+    return { signature, questions: ids.length, errors };
+}
+"""
+
+# Polled every animation frame by wait_for_step. Resolves on the success page; on a
+# new validation message while the previous step is still on screen (one rendered by
+# the next step doesn't count); or once a signature other than the previous step's
+# has held for STEP_QUIET_MS (STEP_EMPTY_QUIET_MS while it has no questions), so a
+# step whose heading is up but whose questions are still mounting isn't taken yet.
+_STEP_WAIT_JS = """
+([previous, errorsBefore, quietMs, emptyQuietMs]) => {
+    if (location.href.includes('/apply/success')) return 'success';
+    const state = (%s)();
+    if (state.signature === previous) {
+        return previous && state.errors > errorsBefore ? 'error' : false;
+    }
+    const now = performance.now();
+    if (state.signature !== window.__stepSignature) {
+        window.__stepSignature = state.signature;
+        window.__stepSince = now;
+        return false;
+    }
+    const quiet = state.questions ? quietMs : emptyQuietMs;
+    return state.signature && now - window.__stepSince >= quiet ? 'changed' : false;
+}
+""" % _STEP_STATE_JS.strip()
+
+
+async def step_state(page: Page) -> Dict:
+    """{"signature", "errors"} of the form step on screen; an empty signature if unreadable."""
+    try:
+        return await page.evaluate(_STEP_STATE_JS)
+    except Exception:
+        return {"signature": "", "questions": 0, "errors": 0}
+
+
+async def wait_for_step(page: Page, previous: Optional[Dict] = None, timeout: int = STEP_READY_MS) -> str:
+    """
+    Wait until a step other than `previous` (a step_state) has rendered — any step
+    when previous is None. Returns "changed", "success" (the success URL loaded),
+    "error" (a validation message appeared on the previous step) or "timeout".
+    """
+    previous = previous or {"signature": "", "errors": 0}
+    try:
+        handle = await page.wait_for_function(
+            _STEP_WAIT_JS, arg=[previous["signature"], previous["errors"], STEP_QUIET_MS, STEP_EMPTY_QUIET_MS],
+            timeout=timeout, polling="raf")
+        return await handle.json_value()
+    except Exception:
+        return "timeout"
+
+
+async def get_question_groups(page: Page, snapshot: bool = True, settle: bool = True, probe: bool = True) -> list:
     """
     Find all question groups on the current form page using confirmed JobStreet selectors.
     Each group is a div containing a label[for^='question-ID_Q'] and its associated input.
+
+    With snapshot=True the whole step is read in one page.evaluate; the per-element
+    scan is only used if that fails (e.g. the page navigated mid-evaluate).
+    settle=False skips the wait for the step's signature to hold, for callers that
+    already waited on it (navigate_form). The bounded wait for question inputs is
+    skipped (probe=False, or after settling) when the step has already held
+    STEP_EMPTY_QUIET_MS with no questions, so question-less steps don't pay for it twice.
     """
-    # The apply page URL confirms we're on the questionnaire step
-    groups = []
-    
     # Wait for React to finish mounting questions before scanning
     # Without this, query_selector_all runs before all select/input elements are attached
-    try:
-        await page.wait_for_selector(
-            "label[for^='question-'], input[type='checkbox'][id^='ID_Q_'], input[type='checkbox'][id^='AU_Q_']",
-            state="attached", timeout=2000
-        )
-        # Brief settle for remaining elements (React batches renders)
-        await page.wait_for_timeout(300)
-    except Exception:
-        pass  # No questions on this step
+    with TIMER.stage("settle"):
+        if settle and await wait_for_step(page, timeout=2000) == "changed":
+            probe = probe and (await step_state(page))["questions"] > 0
+        if probe:
+            try:
+                await page.wait_for_selector(QUESTION_SELECTOR, state="attached", timeout=QUESTION_WAIT_MS)
+            except Exception:
+                pass  # No questions on this step
+
+    if snapshot:
+        try:
+            with TIMER.stage("snapshot"):
+                groups = await page.evaluate(_QUESTION_SNAPSHOT_JS)
+            for g in groups:
+                g["options"] = [c["label"] for c in g["choices"]]
+                g["snapshot"] = True
+                g["page"] = page
+            return groups
+        except Exception as e:
+            console.print(f"      [dim]Question snapshot failed, scanning per element: {e}[/dim]")
+
+    return await _get_question_groups_legacy(page)
+
+
+async def _get_question_groups_legacy(page: Page) -> list:
+    """Per-element question scan: one Playwright round trip per label, input and option."""
+    groups = []
 
     # 1. Locate all standard question labels by their for attribute pattern (handles both ID_Q and AU_Q)
     label_handles = await page.query_selector_all("label[for^='question-']")
@@ -271,7 +607,7 @@ async def get_question_groups(page: Page) -> list:
         seen_prefixes.add(prefix)
         
         # 1. Try finding a label[for^=prefix] heading first
-        heading = await page.query_selector(f"label[for^='{prefix}']")
+        heading = await page.query_selector(f"label[for^='{prefix}']:not([for*='_A_'])")
         if heading:
             heading_text = (await heading.inner_text()).strip()
         else:
@@ -319,15 +655,83 @@ async def get_question_groups(page: Page) -> list:
     return groups
 
 
+def _match_choices(q_data: Dict, answer: str) -> List[Dict]:
+    """Pick the snapshot choices an answer refers to, by label text or 1-based index."""
+    choices = q_data.get("choices", [])
+    if q_data["type"] == "MultiChoice":
+        parts = [a.strip().lower() for a in answer.split("|")]
+    else:
+        parts = [answer.lower()]
+
+    picked = []
+    for part in parts:
+        if not part:
+            continue
+        # An exact label wins, so "1 year" doesn't land on "Less than 1 year" listed before it
+        hits = [c for c in choices if c["label"].strip().lower() == part]
+        if not hits:
+            hits = [c for c in choices if part in c["label"].lower() or c["label"].lower() in part]
+        picked += [c for c in hits if c not in picked]
+    if q_data["type"] != "MultiChoice":
+        picked = picked[:1]
+
+    if not picked and q_data["type"] == "Dropdown":
+        try:
+            idx = int(answer) - 1
+            if 0 <= idx < len(choices):
+                picked.append(choices[idx])
+        except ValueError:
+            pass
+    return picked
+
+
+async def _fill_from_snapshot(q_data: Dict, answer: str) -> bool:
+    """Fill a group from get_question_groups snapshot data — no DOM reads, only the actions."""
+    page: Page = q_data["page"]
+    label_for = q_data["label_for"]
+    q_type = q_data["type"]
+    label = q_data["text"]
+
+    if q_type == "Dropdown":
+        picked = _match_choices(q_data, answer)
+        if not picked:
+            return False
+        sel = _id_selector(label_for)
+        await page.select_option(sel, value=picked[0]["value"], timeout=3000, force=True)
+        await page.dispatch_event(sel, "change")
+        console.print(f"      [green]✓ '{label}' → '{picked[0]['label']}'[/green]")
+        return True
+
+    if q_type in ("Choice", "MultiChoice"):
+        picked = _match_choices(q_data, answer)
+        for c in picked:
+            if not c["checked"]:
+                await page.click(f'label[for="{c["id"]}"]', timeout=3000)
+            console.print(f"      [green]✓ '{label}' → '{c['label']}'[/green]")
+        return bool(picked)
+
+    await page.fill(_id_selector(label_for), answer, timeout=3000)
+    console.print(f"      [green]✓ '{label}' → '{answer[:40]}'[/green]")
+    return True
+
+
 async def fill_question_group(q_data: Dict, answer: str) -> bool:
     """
     Fill a single question group given the answer string.
     Uses confirmed JobStreet DOM patterns.
+    Snapshot groups are filled from their captured option values first; the
+    per-element path below is the fallback when that fails.
     """
     page: Page = q_data["page"]
     label_for = q_data["label_for"]
     q_type = q_data["type"]
     label = q_data["text"]
+    if q_data.get("snapshot"):
+        try:
+            if await _fill_from_snapshot(q_data, answer):
+                return True
+        except Exception as e:
+            console.print(f"      [dim]Snapshot fill failed for '{label}', retrying per element: {e}[/dim]")
     try:
         if q_type == "Dropdown":
             select = await page.query_selector(f"#{label_for}")
@@ -404,6 +808,88 @@ async def fill_question_group(q_data: Dict, answer: str) -> bool:
     return False
 
 
+# Applies every resolved answer of a step in one round trip. Values go through the
+# prototype's native setter (React ignores a plain el.value = ... on controlled
+# inputs) followed by input/change events; radios and checkboxes are click()ed so
+# React sees the toggle. Returns, per item, whether the DOM shows the answer afterwards.
+_BATCH_FILL_JS = """
+(items) => {
+    const setValue = (el, value) => {
+        const proto = el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+            : el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+            : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+        return el.value === value;
+    };
+    return items.map(it => {
+        try {
+            if (it.type === 'Choice' || it.type === 'MultiChoice') {
+                let ok = it.values.length > 0;
+                for (const id of it.values) {
+                    const inp = document.getElementById(id);
+                    if (!inp) { ok = false; continue; }
+                    if (!inp.checked) inp.click();
+                    ok = ok && inp.checked;
+                }
+                return ok;
+            }
+            const el = document.getElementById(it.id);
+            if (!el) return false;
+            if (it.type === 'Dropdown') {
+                return el.tagName === 'SELECT' && setValue(el, it.values[0]);
+            }
+            return (el.tagName === 'INPUT' || el.tagName === 'TEXTAREA') && setValue(el, it.text);
+        } catch (e) {
+            return false;
+        }
+    });
+}
+"""
+
+
+async def fill_step(page: Page, fills: List[Tuple[Dict, str]]) -> List[bool]:
+    """
+    Fill every (question group, answer) of a step; returns per fill whether it took.
+    Snapshot groups go through _BATCH_FILL_JS in a single page.evaluate; the ones it
+    couldn't fill (and legacy groups) fall back to fill_question_group one by one.
+    """
+    results = [False] * len(fills)
+    batch: List[Tuple[int, str]] = []  # (index into fills, what to report as chosen)
+    items: List[Dict] = []
+    for i, (q_data, answer) in enumerate(fills):
+        if not q_data.get("snapshot"):
+            continue
+        q_type = q_data["type"]
+        if q_type in ("Dropdown", "Choice", "MultiChoice"):
+            picked = _match_choices(q_data, answer)
+            if not picked:
+                continue
+            values = [picked[0]["value"]] if q_type == "Dropdown" else [c["id"] for c in picked]
+            shown = " | ".join(c["label"] for c in picked)
+        else:
+            values, shown = [], answer[:40]
+        items.append({"type": q_type, "id": q_data["label_for"], "values": values, "text": answer})
+        batch.append((i, shown))
+
+    if items:
+        try:
+            filled = await page.evaluate(_BATCH_FILL_JS, items)
+        except Exception as e:
+            console.print(f"      [dim]Batch fill failed, filling per question: {e}[/dim]")
+            filled = [False] * len(items)
+        for (i, shown), ok in zip(batch, filled):
+            results[i] = ok
+            if ok:
+                console.print(f"      [green]✓ '{fills[i][0]['text']}' → '{shown}'[/green]")
+
+    for i, (q_data, answer) in enumerate(fills):
+        if not results[i]:
+            results[i] = await fill_question_group(q_data, answer)
+    return results
+
+
 async def prompt_for_answer(q_data: Dict, auto_mode: str) -> str:
     """
     python-patterns: use asyncio.to_thread so blocking Prompt.ask
@@ -414,31 +900,13 @@ async def prompt_for_answer(q_data: Dict, auto_mode: str) -> str:
 
     options = q_data.get("options", [])
 
-    q_text_lower = q_data['text'].lower()
-    is_years_exp = "how many years" in q_text_lower or "berapa tahun pengalaman" in q_text_lower
-
-    if is_years_exp and q_data["type"] in ("Dropdown", "Choice") and options:
-        import msvcrt
-        import random
-
-        if auto_mode == "Semi":
-            console.print("  [cyan]Semi-Auto Mode: Waiting 2s (Press any key to cancel/answer manually)...[/cyan]")
-            for _ in range(20):
-                if msvcrt.kbhit():
-                    break
-                await asyncio.sleep(0.1)
-            else:
-                return _auto_select_exp(options)
-        else:
-            console.print("  [cyan]Fully Auto Mode: Instantly resolving experience question...[/cyan]")
-            return _auto_select_exp(options)
-
     if q_data["type"] in ("Dropdown", "Choice", "MultiChoice") and options:
         for i, opt in enumerate(options, 1):
             console.print(f"  {i}. {opt}")
             
         prompt_txt = "Select number(s) comma-separated or type exact text" if q_data["type"] == "MultiChoice" else "Select number or type exact text"
-        raw = await asyncio.to_thread(Prompt.ask, prompt_txt, default="1")
+        with TIMER.stage("prompt", human=True):
+            raw = await asyncio.to_thread(Prompt.ask, prompt_txt, default="1")
         
         if q_data["type"] == "MultiChoice":
             parts = [p.strip() for p in raw.split(",")]
@@ -457,29 +925,44 @@ async def prompt_for_answer(q_data: Dict, auto_mode: str) -> str:
             except ValueError:
                 return raw
     else:
-        return await asyncio.to_thread(Prompt.ask, "Your answer")
-
-
-def _auto_select_exp(options: List[str]) -> str:
-    import random
-    is_less = random.random() < 0.6
-    ans_str = ""
-    for opt in options:
-        opt_lower = opt.lower()
-        if is_less:
-            if "less" in opt_lower or "kurang" in opt_lower:
-                ans_str = opt
-                break
-        else:
-            if ("1 year" in opt_lower or "1 tahun" in opt_lower) and "less" not in opt_lower and "kurang" not in opt_lower:
-                ans_str = opt
-                break
-    
-    if not ans_str:
-        ans_str = options[1] if len(options) > 1 else options[0]
+        with TIMER.stage("prompt", human=True):
+            return await asyncio.to_thread(Prompt.ask, "Your answer")
 
-    console.print(f"  [bold cyan]Auto-selected: {ans_str}[/bold cyan]")
-    return ans_str
+
+def _key_pressed() -> bool:
+    """Non-blocking: has the user pressed a key (Windows) or Enter (other terminals)? Consumes it."""
+    if os.name == "nt":
+        import msvcrt
+        if msvcrt.kbhit():
+            msvcrt.getwch()
+            return True
+        return False
+    import select
+    import sys
+    if not sys.stdin.isatty():
+        return False
+    ready, _, _ = select.select([sys.stdin], [], [], 0)
+    if ready:
+        sys.stdin.readline()
+        return True
+    return False
+
+
+async def accept_rule_answer(ruled: RuleAnswer, auto_mode: str) -> bool:
+    """
+    Fully auto takes a rule's answer straight away; semi auto gives the user 2s to
+    press a key and answer it by hand instead.
+    """
+    console.print(f"      [cyan]Rule '{ruled.rule}' (profile {ruled.value:g}) → {ruled.answer}[/cyan]")
+    if auto_mode != "Semi":
+        return True
+    console.print("      [cyan]Semi-Auto Mode: Waiting 2s (press a key / Enter to answer manually)...[/cyan]")
+    with TIMER.stage("prompt", human=True):
+        for _ in range(20):
+            if _key_pressed():
+                return False
+            await asyncio.sleep(0.1)
+    return True
 
 
 async def fill_answer(q_data: Dict, answer: str) -> bool:
@@ -533,10 +1016,15 @@ async def fill_answer(q_data: Dict, answer: str) -> bool:
 # Form Wizard Navigator
 # ---------------------------------------------------------------------------
 
-async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_run: bool, auto_mode: str, job_log: Dict) -> bool:
+async def navigate_form(page: Page, answers_db: QuestionIndex, title: str, dry_run: bool, auto_mode: str, job_log: Dict,
+                        park_unknown: bool = False) -> bool:
     """
     Walk through a multi-step application form using confirmed JobStreet selectors.
     Auto-fills known answers, prompts for unknowns, handles Lanjut/Kirim buttons.
+
+    With park_unknown, a step with questions that would need a person is not prompted:
+    they are listed in job_log["parked"] and the form is left (returns False), for the
+    run to put the job in the pending queue.
     """
     # Wait to land on the apply page
     try:
@@ -544,23 +1032,20 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
     except Exception:
         pass
 
-    last_url = ""
+    last_signature: Optional[str] = None
     stuck_count = 0
     answered_questions: set = set()  # Track answered questions to avoid re-prompting on later steps
 
     for step in range(15):
-        try:
-            # Wait for either questions, headers, or the Next/Submit buttons to spawn
-            await page.wait_for_selector(
-                "label[for^='question-'], fieldset[role='radiogroup'], h2, button:has-text('Lanjut'), button:has-text('Next'), button:has-text('Kirim'), button:has-text('Submit')", 
-                timeout=3000
-            )
-        except Exception:
-            pass
+        # Wait for the step's questions or headings to render (immediate if they already have)
+        with TIMER.stage("step_wait"):
+            ready = await wait_for_step(page)
         current_url = page.url
+        state = await step_state(page)
         
-        # Anti-loop guard: if we're stuck on the same URL for 3 iterations, abort
-        if current_url == last_url:
+        # Anti-loop guard: if the same step (same questions and headings, whatever the
+        # URL says) is still on screen after 3 iterations, abort
+        if state["signature"] == last_signature:
             stuck_count += 1
             if stuck_count == 1:
                 await page.screenshot(path="debug_loop.png")
@@ -571,7 +1056,7 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
                 console.print(f"  [red]Stuck in infinite loop on {current_url} — aborting application.[/red]")
                 return False
         else:
-            last_url = current_url
+            last_signature = state["signature"]
             stuck_count = 0
 
         # If we got redirected to login or Google OAuth, pause and wait for user to sign in
@@ -579,15 +1064,15 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
             console.print("  [bold yellow]⚠ Login required — please sign in to JobStreet in the browser![/bold yellow]")
             console.print("  [dim]The script will continue automatically once you're logged in...[/dim]")
             try:
-                await page.wait_for_url(
-                    lambda url: "jobstreet.com" in url
-                        and "login" not in url
-                        and "masuk" not in url
-                        and "accounts.google" not in url
-                        and "seek.com/login" not in url,
-                    timeout=0  # Wait indefinitely
-                )
-                await page.wait_for_timeout(2000)
+                with TIMER.stage("login_wait", human=True):
+                    await page.wait_for_url(
+                        lambda url: "jobstreet.com" in url
+                            and "login" not in url
+                            and "masuk" not in url
+                            and "accounts.google" not in url
+                            and "seek.com/login" not in url,
+                        timeout=0  # Wait indefinitely
+                    )
                 console.print("  [green]✓ Logged in! Continuing...[/green]")
                 continue  # Re-enter loop from current URL
             except Exception as e:
@@ -617,10 +1102,15 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
                         await page.screenshot(path=f"automaton/logs/submit_debug_{int(time.time())}.png", full_page=True)
                         return False
 
-        groups = await get_question_groups(page)
+        # A step that held the empty-quiet period without questions has none to probe for
+        groups = await get_question_groups(page, settle=False,
+                                           probe=not (ready == "changed" and state["questions"] == 0))
         console.print(f"    [dim]Step {step + 1} ({current_url.split('/')[-1]}): {len(groups)} questions[/dim]")
 
         had_missing = False
+        parked: List[Dict] = []
+        resolved: List[Tuple[Dict, str, str]] = []  # (group, answer, match tier) to fill in one batch
+        unknown: List[Dict] = []
         for q_data in groups:
             q_text = q_data["text"]
             
@@ -629,38 +1119,63 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
                 console.print(f"      [dim]Skipping duplicate: '{q_text[:60]}'[/dim]")
                 continue
             
-            # 1. Exact match
-            matched_answer = answers_db.get(q_text)
-            
+            # 1. Exact or normalized question from the bank, 2. a numeric-range rule
+            # (years, salary, notice) from the profile, 3. a similar question from the bank
+            match = answers_db.lookup(q_text, q_data["options"], q_data["type"])
+            matched_answer = match.answer if match else None
+            tier = match.tier if match else ""
+            if match is None or match.tier == "similar":
+                ruled = rule_answer(q_text, q_data["type"], q_data["options"])
+                if ruled and await accept_rule_answer(ruled, auto_mode):
+                    matched_answer, tier = ruled.answer, f"rule:{ruled.rule}"
+            if match and tier in ("normalized", "similar"):
+                console.print(f"      [dim]Matched ({match.tier} {match.score:.2f}): '{match.question[:60]}'[/dim]")
 
             if matched_answer:
-                success = await fill_question_group(q_data, matched_answer)
-                if not success:
-                    console.print(f"      [yellow]⚠ Saved answer '{matched_answer}' failed to apply. Prompting...[/yellow]")
-                    ans = await prompt_for_answer(q_data, auto_mode)
-                    answers_db[q_text] = ans
-                    append_question(q_text, q_data["type"], ans, q_data["options"] or None)
-                    console.print(f"      [bold green]Saved to bank![/bold green]")
-                    ok = await fill_question_group(q_data, ans)
-                    if ok:
-                        job_log["questions"].append({"question": q_text, "answer": ans})
-                        answered_questions.add(q_text)
-                    elif q_data["is_required"]:
-                        had_missing = True
-                else:
-                    job_log["questions"].append({"question": q_text, "answer": matched_answer})
-                    answered_questions.add(q_text)
+                resolved.append((q_data, matched_answer, tier))
             else:
-                ans = await prompt_for_answer(q_data, auto_mode)
-                answers_db[q_text] = ans
-                append_question(q_text, q_data["type"], ans, q_data["options"] or None)
-                console.print(f"      [bold green]Saved to bank![/bold green]")
+                unknown.append(q_data)
+
+        filled: List[bool] = []
+        if resolved:
+            with TIMER.stage("fill"):
+                filled = await fill_step(page, [(q, ans) for q, ans, _ in resolved])
+        for (q_data, matched_answer, tier), success in zip(resolved, filled):
+            q_text = q_data["text"]
+            if success:
+                job_log["questions"].append({"question": q_text, "answer": matched_answer, "match": tier})
+                answered_questions.add(q_text)
+            elif park_unknown:
+                console.print(f"      [yellow]⚠ Saved answer '{matched_answer}' failed to apply. Parking...[/yellow]")
+                # Marked, so the pending queue waits for a new answer instead of retrying this one
+                parked.append({**{k: q_data[k] for k in ("text", "type", "options")}, "failed_answer": matched_answer})
+            else:
+                console.print(f"      [yellow]⚠ Saved answer '{matched_answer}' failed to apply. Prompting...[/yellow]")
+                unknown.append(q_data)
+
+        for q_data in unknown:
+            q_text = q_data["text"]
+            if park_unknown:
+                console.print(f"      [yellow]? Unknown, parked: '{q_text[:60]}'[/yellow]")
+                parked.append({k: q_data[k] for k in ("text", "type", "options")})
+                continue
+            ans = await prompt_for_answer(q_data, auto_mode)
+            answers_db.add(q_text, ans, q_data["type"])
+            append_question(q_text, q_data["type"], ans, q_data["options"] or None)
+            console.print(f"      [bold green]Saved to bank![/bold green]")
+            with TIMER.stage("fill"):
                 ok = await fill_question_group(q_data, ans)
-                if ok:
-                    job_log["questions"].append({"question": q_text, "answer": ans})
-                    answered_questions.add(q_text)
-                elif q_data["is_required"]:
-                    had_missing = True
+            if ok:
+                job_log["questions"].append({"question": q_text, "answer": ans,
+                                             "type": q_data["type"], "options": q_data["options"]})
+                answered_questions.add(q_text)
+            elif q_data["is_required"]:
+                had_missing = True
+
+        if parked:
+            job_log["parked"] = parked
+            console.print(f"    [yellow]{len(parked)} question(s) need an answer — job parked for later.[/yellow]")
+            return False
 
         if had_missing:
             console.print("    [red]Required field unanswered — skipping.[/red]")
@@ -671,7 +1186,8 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
 
         try:
             # Wait concurrently for either button to render (fixes React race condition without sequential penalties)
-            await submit.or_(nxt).wait_for(state="attached", timeout=3000)
+            with TIMER.stage("buttons"):
+                await submit.or_(nxt).wait_for(state="attached", timeout=3000)
         except Exception:
             pass
 
@@ -688,7 +1204,8 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
                     
                     # Wait for the URL to change to the success page as the ultimate source of truth
                     try:
-                        await page.wait_for_url("**/apply/success*", timeout=4000)
+                        with TIMER.stage("submit"):
+                            await page.wait_for_url("**/apply/success*", timeout=4000)
                         console.print("    [dim]Success URL confirmed.[/dim]")
                     except Exception:
                         console.print(f"    [red]Validation Error: Did not reach success URL. Final URL = {page.url}[/red]")
@@ -711,9 +1228,17 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
                 console.print("    [red]Lanjut button is disabled — a required field was missed![/red]")
                 return False
             
-            await safe_click(nxt)
-            # Wait for URL to change or new questions to appear
-            await page.wait_for_load_state("domcontentloaded")
+            # Wait for the next step to render (URL change or not), the success page or a validation error
+            with TIMER.stage("next"):
+                before = await step_state(page)
+                await safe_click(nxt)
+                outcome = await wait_for_step(page, before, timeout=STEP_CHANGE_MS)
+            if outcome == "success":
+                console.print(f"  [bold green]✓ Applied '{title}'[/bold green]")
+                return True
+            if outcome == "error":
+                console.print("    [red]Validation error after Lanjut — a field was rejected, skipping.[/red]")
+                return False
             continue
 
         console.print(f"    [yellow]No Lanjut/Kirim on {current_url.split('/')[-1]} — done.[/yellow]")
@@ -725,338 +1250,739 @@ async def navigate_form(page: Page, answers_db: Dict[str, str], title: str, dry_
 # Main Application Loop
 # ---------------------------------------------------------------------------
 
-async def run(keyword: str, location: str, exclude_list: List[str], max_apps: int, dry_run: bool, auto_mode: str) -> None:
+_APPLY_SKIP_REASONS = {
+    APPLY_EXTERNAL: "external application",
+    APPLY_NONE: "no apply button",
+    APPLY_EXTERNAL_SITE: "external site text",
+}
+
+
+def detail_skip_reason(detail: Dict, title: str, location: str, matcher: ExclusionMatcher) -> Tuple[str, str]:
     """
-    Main application loop to search for jobs and apply.
-    Uses Playwright's persistent context to reuse an existing Chrome profile
-    for logged-in sessions.
+    Judge a job on its detail fields, freshly scraped or from the job cache: location,
+    description keywords, apply type. Returns (reason, keyword) or ("", "") to apply.
     """
-    answers_db = load_answers()
-    applied_history = load_applied_jobs()
-    console.print(f"[green]Questions bank: {len(answers_db)} | History: {len(applied_history)}[/green]")
+    loc_text = detail["location"]
+    # Enforce strict location check (JobStreet sometimes injects recommended jobs outside the search area)
+    if location and loc_text != "Unknown" and location.lower() not in loc_text.lower():
+        return "location filter", loc_text
 
-    import datetime
-    start_time = datetime.datetime.now()
-    run_timestamp = start_time.strftime("%Y-%m-%d_%H-%M-%S")
-    run_log = {
-        "timestamp": run_timestamp,
-        "settings": {
-            "start_time": start_time.isoformat(),
-            "end_time": None,
-            "keyword": keyword,
-            "location": location,
-            "exclude_list": exclude_list,
-            "max_apps": max_apps,
-            "dry_run": dry_run,
-            "auto_mode": auto_mode
-        },
-        "applied_jobs": [],
-        "skipped_jobs": []
-    }
+    if detail["description"]:
+        is_valid, matched_kw = matcher.check(title, detail["description"])
+        if not is_valid:
+            return "desc filter", matched_kw
+
+    return _APPLY_SKIP_REASONS.get(detail["apply_type"], ""), ""
 
+
+async def scrape_job_detail(job_page: Page, job: Dict):
+    """
+    Read location, salary, description and apply type off an open detail page.
+    Returns (detail, apply button locator); card values are the location/salary fallback.
+    """
+    loc_text, sal_text = job.get("location") or "Unknown", job.get("salary") or "Hidden"
     try:
-        async with async_playwright() as pw:
-            # browser-automation skill: dedicated Playwright profile
-            # - No conflict with real Chrome (separate profile dir)
-            # - Session is SAVED after first login: no re-login needed on next run
-            # - First run only: browser opens, user logs in manually, presses Enter
-            import subprocess
-            subprocess.run(["taskkill", "/F", "/IM", "chrome.exe", "/T"], capture_output=True)
-            await asyncio.sleep(1)
+        loc_el = job_page.locator("[data-automation='job-detail-location']")
+        if await loc_el.count():
+            loc_text = await loc_el.first.inner_text()
+        sal_el = job_page.locator("[data-automation='job-detail-salary']")
+        if await sal_el.count():
+            sal_text = await sal_el.first.inner_text()
+    except Exception:
+        pass
 
-            console.print("[dim]Launching browser...[/dim]")
-            context: BrowserContext = await pw.chromium.launch_persistent_context(
-                user_data_dir=PLAYWRIGHT_PROFILE,
-                headless=False,
-                slow_mo=30,
-                viewport={"width": 1280, "height": 900},
-                args=["--disable-blink-features=AutomationControlled"],
-            )
+    desc = ""
+    try:
+        desc_el = job_page.locator("div[data-automation='jobAdDetails']")
+        if await desc_el.count():
+            desc = await desc_el.first.inner_text()
+    except Exception:
+        pass
 
-            # Reliable login check: look for a user-specific nav element in the DOM
-            # The profile/avatar link only renders when a session exists
-            check_page: Page = await context.new_page()
-            console.print("[dim]Checking login status...[/dim]")
-            await check_page.goto("https://id.jobstreet.com", wait_until="domcontentloaded", timeout=20000)
-            await check_page.wait_for_timeout(2000)
-
-            # Check for login button (shown when logged out) vs profile icon (shown when logged in)
-            login_btn_visible = await check_page.locator("a[href*='/id/login'], a:has-text('Masuk')").count()
-            is_logged_out = login_btn_visible > 0 or "login" in check_page.url or "accounts.google" in check_page.url
-
-            if is_logged_out:
-                console.print("\n[bold yellow]═══ LOGIN REQUIRED ═══[/bold yellow]")
-                console.print("Please log in to JobStreet in the browser window (use Google, etc.)")
-                console.print("[dim]The script will continue automatically once you're logged in.[/dim]")
-                # Wait until user is on a jobstreet page that isn't login
-                await check_page.wait_for_url(
-                    lambda url: "jobstreet.com" in url
-                        and "login" not in url
-                        and "masuk" not in url
-                        and "accounts.google" not in url
-                        and "seek.com/login" not in url,
-                    timeout=0
-                )
-                await check_page.wait_for_timeout(2000)
-                console.print("[bold green]✓ Logged in! Starting automation...[/bold green]")
-            else:
-                console.print("[green]✓ Already logged in.[/green]")
+    apply_btn = job_page.locator('a[data-automation="job-detail-apply"]')
+    if await job_page.locator('a[data-automation="job-detail-apply-external"]').count():
+        apply_type = APPLY_EXTERNAL
+    else:
+        if not await apply_btn.count():
+            # Fallback - look for a Quick Apply button that isn't external
+            apply_btn = job_page.locator("button:has-text('Lamaran Cepat'), button:has-text('Apply')")
+        if not await apply_btn.count():
+            apply_type = APPLY_NONE
+        else:
+            btn_text = (await apply_btn.first.inner_text()).lower()
+            apply_type = APPLY_EXTERNAL_SITE if "situs" in btn_text or "site" in btn_text else APPLY_INTERNAL
 
-            await check_page.close()
+    detail = {"location": loc_text, "salary": sal_text, "description": desc, "apply_type": apply_type}
+    return detail, apply_btn
 
-            is_recommendation_mode = not keyword.strip()
 
-            if is_recommendation_mode:
-                search_url = "https://id.jobstreet.com/"
-            else:
-                safe_kw = keyword.replace(" ", "-").lower()
-                safe_loc = location.replace(" ", "-").lower()
-                import urllib.parse
-                encoded_loc = urllib.parse.quote(location)
-                search_url = f"https://id.jobstreet.com/id/job-search/{safe_kw}-jobs/in-{safe_loc}//?where={encoded_loc}"
+async def prefetch_job(context: BrowserContext, job: Dict, location: str, matcher: ExclusionMatcher,
+                       run_log: RunLogger, checkpoint: Checkpoint, job_cache: JobCache) -> Optional[Dict]:
+    """
+    Open a job detail page and run every check that needs it (location, description,
+    external/apply button). Returns the candidate with its page still open, or None
+    if the job was skipped — the page is closed in that case.
 
-            main_page: Page = await context.new_page()
-        
-            if is_recommendation_mode:
-                console.print(f"[magenta]Recommendation Mode Active (Homepage)[/magenta]")
-            console.print(f"[cyan]Navigating to {search_url}[/cyan]")
-        
-            await main_page.goto(search_url, wait_until="domcontentloaded")
+    A job with a fresh job-cache entry is judged from the cache first, and its page is
+    only opened if it passes.
+    """
+    title = job["title"]
+    clean_url = job["clean_url"]
+
+    def skip(reason: str, kw: str = "") -> None:
+        run_log.skip(title, clean_url, reason, kw)
+        checkpoint.record(job["job_id"], "skipped", reason)
+
+    cached = job_cache.get(job["job_id"])
+    if cached:
+        reason, kw = detail_skip_reason(cached, title, location, matcher)
+        if reason:
+            console.print(f"[yellow]  Skip ({reason}, cached): {title}[/yellow]")
+            skip(reason, kw)
+            return None
+
+    job_page: Page = await context.new_page()
+    try:
+        try:
+            with TIMER.stage("load", job_id=job["job_id"]):
+                await job_page.goto(job["job_url"], timeout=45000, wait_until="domcontentloaded")
+                try:
+                    await job_page.wait_for_selector('a[data-automation="job-detail-apply"], div[data-automation="jobAdDetails"]', timeout=8000)
+                except Exception:
+                    pass
+        except Exception as e:
+            console.print(f"  [red]Load failed ({title}): {e}[/red]")
+            await job_page.close()
+            return None
+
+        with TIMER.stage("filter"):
+            detail, apply_btn = await scrape_job_detail(job_page, job)
+            job_cache.put(job["job_id"], detail["location"], detail["salary"], detail["description"], detail["apply_type"])
+            reason, kw = detail_skip_reason(detail, title, location, matcher)
+            if reason:
+                console.print(f"[yellow]  Skip ({reason}): {title}[/yellow]")
+                skip(reason, kw)
+                await job_page.close()
+                return None
+
+        return {**job, "page": job_page, "apply_btn": apply_btn, "loc_text": detail["location"], "sal_text": detail["salary"]}
+    except asyncio.CancelledError:
+        await job_page.close()
+        raise
+    except Exception as e:
+        console.print(f"  [red]Evaluate error ({title}): {e}[/red]")
+        try:
+            await job_page.close()
+        except Exception:
+            pass
+        return None
+
+
+async def _evaluation_worker(context: BrowserContext, jobs: asyncio.Queue, candidates: asyncio.Queue,
+                             location: str, matcher: ExclusionMatcher,
+                             run_log: RunLogger, checkpoint: Checkpoint, job_cache: JobCache) -> None:
+    """Pull jobs until the queue is empty; push the ones that pass every filter."""
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        cand = await prefetch_job(context, job, location, matcher, run_log, checkpoint, job_cache)
+        if cand is None:
+            continue
+        try:
+            await candidates.put(cand)
+        except asyncio.CancelledError:
+            await cand["page"].close()
+            raise
+
+
+async def _close_when_done(workers: List[asyncio.Task], candidates: asyncio.Queue) -> None:
+    """Signal the apply stage (None sentinel) once every worker has finished or been cancelled."""
+    await asyncio.gather(*workers, return_exceptions=True)
+    await candidates.put(None)
+
+
+async def apply_to_job(cand: Dict, answers_db: QuestionIndex, dry_run: bool, auto_mode: str,
+                       park_unknown: bool = False) -> Optional[Dict]:
+    """
+    Click Apply on a prefetched candidate and walk the form. Returns the job log on success;
+    a job parked on unknown questions gets them as cand["parked"].
+    """
+    job_page: Page = cand["page"]
+    title = cand["title"]
+    console.print(f"\n[cyan]→ {title}[/cyan]")
+    try:
+        # Other tabs are being opened concurrently by the evaluation workers,
+        # so catch the apply tab via this page's popup event rather than context.pages[-1]
+        popups: List[Page] = []
+        job_page.on("popup", popups.append)
+
+        console.print("  [magenta]Applying...[/magenta]")
+        await job_page.bring_to_front()
+        await safe_click(cand["apply_btn"].first)
+        try:
+            await job_page.wait_for_load_state("domcontentloaded", timeout=5000)
+        except Exception:
+            pass
+
+        # Handle application in new tab vs same page
+        apply_page = popups[0] if popups else job_page
+        new_tab = apply_page != job_page
+        if new_tab:
+            await apply_page.bring_to_front()
+
+        job_log = {
+            "title": title,
+            "url": cand["clean_url"],
+            "location": cand["loc_text"],
+            "salary": cand["sal_text"],
+            "questions": []
+        }
+        success = await navigate_form(apply_page, answers_db, title, dry_run, auto_mode, job_log, park_unknown)
+        if job_log.get("parked"):
+            cand["parked"] = job_log["parked"]
+
+        if new_tab:
+            await apply_page.close()
+        await job_page.close()
+        return job_log if success else None
+
+    except Exception as e:
+        console.print(f"  [red]Apply error: {e}[/red]")
+        try:
+            await job_page.close()
+        except Exception:
+            pass
+        return None
+
+
+async def reopen_parked(context: BrowserContext, job: Dict) -> Optional[Dict]:
+    """Open a parked job's detail page again as a candidate; None if it can't be applied to here any more."""
+    job_page: Page = await context.new_page()
+    try:
+        with TIMER.stage("load", job_id=job["job_id"]):
+            await job_page.goto(job["job_url"], timeout=45000, wait_until="domcontentloaded")
             try:
-                await main_page.wait_for_selector('article[data-automation="normalJob"], a[data-automation^="recommendedJobLink_"]', timeout=10000)
+                await job_page.wait_for_selector('a[data-automation="job-detail-apply"]', timeout=8000)
             except Exception:
                 pass
+        detail, apply_btn = await scrape_job_detail(job_page, job)
+        if detail["apply_type"] != APPLY_INTERNAL:
+            console.print(f"  [yellow]Parked job can't be applied to any more ({detail['apply_type']}): {job['title']}[/yellow]")
+            await job_page.close()
+            return None
+        return {**job, "page": job_page, "apply_btn": apply_btn, "loc_text": detail["location"], "sal_text": detail["salary"]}
+    except Exception as e:
+        console.print(f"  [red]Re-open failed ({job['title']}): {e}[/red]")
+        try:
+            await job_page.close()
+        except Exception:
+            pass
+        return None
 
-            console.print("[bold]Scanning for jobs...[/bold]\n")
-            apps_done = 0
-            empty_recs_count = 0
 
-            while apps_done < max_apps:
-                # Cast a wide net for all potential job links on the page (SERP or Homepage)
+async def _reload_recommendations(page: Page) -> None:
+    await page.reload(wait_until="domcontentloaded")
+    try:
+        await page.wait_for_selector(JOB_LIST_SELECTOR, timeout=10000)
+    except Exception:
+        pass
+
+
+async def serp_batches(page: Page, is_recommendation_mode: bool,
+                       page_no: int = 1) -> AsyncIterator[Tuple[int, Dict[str, Dict]]]:
+    """
+    Job cards from the browser as (results page number, cards), one SERP page (or
+    homepage refresh) per batch. Paginates with the Next link; recommendation mode
+    reloads the homepage.
+
+    Ids already yielded in this run are dropped before anything else looks at them,
+    so a refresh showing the same recommendations costs nothing downstream. A refresh
+    with nothing new waits REC_BACKOFF_BASE, then twice as long each time (capped at
+    REC_BACKOFF_MAX), and after REC_MAX_STALE such refreshes in a row the homepage is
+    taken to be out of recommendations.
+    """
+    seen: Set[str] = set()
+    stale = 0
+    while True:
+        # Cast a wide net for all potential job links on the page (SERP or Homepage)
+        with TIMER.stage("serp"):
+            cards = await harvest_job_cards(page)
+        unique = {job_id: card for job_id, card in cards.items() if job_id not in seen}
+        seen.update(unique)
+        console.print(f"[dim]  {len(cards)} jobs visible, {len(unique)} new[/dim]")
+
+        if not cards and not is_recommendation_mode:
+            console.print("[yellow]No jobs found on this page.[/yellow]")
+            return
+        if not unique and is_recommendation_mode:
+            stale += 1
+            if stale >= REC_MAX_STALE:
+                console.print(f"[yellow]No new recommendations after {stale} refreshes. Done.[/yellow]")
+                return
+            delay = min(REC_BACKOFF_BASE * 2 ** (stale - 1), REC_BACKOFF_MAX)
+            console.print(f"[yellow]Nothing new. Refreshing homepage in {delay:.0f}s ({stale}/{REC_MAX_STALE})...[/yellow]")
+            with TIMER.stage("rec_backoff"):
+                await asyncio.sleep(delay)
+            await _reload_recommendations(page)
+            continue
+
+        if unique:
+            stale = 0  # Reset upon finding new jobs
+            yield page_no, unique
+
+        # Paginate or Refresh
+        if is_recommendation_mode:
+            console.print("[dim]Checking for fresh recommendations...[/dim]")
+            await _reload_recommendations(page)
+        else:
+            next_btn = page.get_by_role("link", name=re.compile(r"(Selanjutnya|Next)", re.IGNORECASE))
+            if await next_btn.count():
+                await safe_click(next_btn.first)
+                page_no += 1
                 try:
-                    all_links = await main_page.locator('a[href*="/job/"]').element_handles()
+                    await page.wait_for_selector('article[data-automation="normalJob"]', state="attached", timeout=10000)
                 except Exception:
-                    all_links = []
+                    pass
+            else:
+                console.print("[dim]End of pages.[/dim]")
+                return
 
-                unique: Dict[str, Dict] = {}
-                for link in all_links:
-                    try:
-                        href = await link.get_attribute("href") or ""
-                        if "/job/" not in href:
-                            continue
-                            
-                        # Extract numeric job ID to avoid duplicates (e.g., /id/job/12345678)
-                        job_id_match = re.search(r"/job/(\d+)", href)
-                        if not job_id_match:
-                            continue
-                        job_id = job_id_match.group(1)
-                        
-                        # Grab text. JobStreet links often wrap the entire card or just have the title.
-                        raw_text = (await link.inner_text()).strip()
-                        if not raw_text:
-                            raw_text = await link.get_attribute("aria-label") or await link.get_attribute("title") or ""
-                            
-                        # The first line of a card is almost always the Job Title
-                        title = raw_text.split("\n")[0].strip()
-                        
-                        # Filter out utility links that share the /job/ path but aren't the job title
-                        ignore_texts = ["simpan", "save", "lamaran cepat", "quick apply", "lihat semua", "see all"]
-                        if href and len(title) > 3 and title.lower() not in ignore_texts:
-                            if job_id not in unique:
-                                unique[job_id] = {"title": title, "href": href}
-                    except Exception:
-                        continue
 
-                console.print(f"[dim]  {len(unique)} jobs visible[/dim]")
-                if not unique:
-                    if is_recommendation_mode:
-                        empty_recs_count += 1
-                        if empty_recs_count >= 5:
-                            console.print("[yellow]No more recommendations found after 5 retries. Done.[/yellow]")
-                            break
-                        console.print(f"[yellow]No jobs found. Refreshing homepage ({empty_recs_count}/5)...[/yellow]")
-                        await main_page.reload(wait_until="domcontentloaded")
-                        try:
-                            await main_page.wait_for_selector('article[data-automation="normalJob"], a[data-automation^="recommendedJobLink_"]', timeout=8000)
-                        except Exception:
-                            pass
-                        continue
-                    else:
-                        console.print("[yellow]No jobs found on this page.[/yellow]")
-                        break
+async def api_batches(client: JobSearchClient, keyword: str, location: str, first_page: Tuple[List[Dict], int],
+                      page_no: int = 1) -> AsyncIterator[Tuple[int, Dict[str, Dict]]]:
+    """
+    Job cards from the search API as (results page number, cards), one page per batch,
+    starting with first_page (already fetched, page page_no). The next page is
+    requested in a thread while the caller evaluates the current one.
+    """
+    seen: Set[str] = set()
+    pending: Optional[asyncio.Future] = None
+    jobs, total = first_page
+    try:
+        while jobs:
+            if page_no * client.page_size < total:
+                pending = asyncio.ensure_future(asyncio.to_thread(client.search_page, keyword, location, page_no + 1))
+            unique = {j["job_id"]: j for j in jobs if j["job_id"] not in seen}
+            seen.update(unique)
+            console.print(f"[dim]  {len(unique)} jobs from API page {page_no} ({len(seen)}/{total})[/dim]")
+            if unique:
+                yield page_no, unique
+            if pending is None:
+                return
+            try:
+                with TIMER.stage("discover"):
+                    jobs, total = await pending
+            except Exception as e:
+                console.print(f"[yellow]Search API page {page_no + 1} failed: {e}[/yellow]")
+                return
+            finally:
+                pending = None
+            page_no += 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+        client.close()
 
-                empty_recs_count = 0  # Reset upon finding jobs
 
-                for job_id, data in unique.items():
-                    if apps_done >= max_apps:
-                        break
+def search_url_for(keyword: str, location: str) -> str:
+    """SERP URL for a query; the homepage (recommendation mode) when there's no keyword."""
+    if not keyword.strip():
+        return "https://id.jobstreet.com/"
+    safe_kw = keyword.replace(" ", "-").lower()
+    safe_loc = location.replace(" ", "-").lower()
+    encoded_loc = urllib.parse.quote(location)
+    return f"https://id.jobstreet.com/id/job-search/{safe_kw}-jobs/in-{safe_loc}//?where={encoded_loc}"
 
-                    title = data["title"]
-                    href = data["href"]
-                    job_url = href if href.startswith("http") else f"https://id.jobstreet.com{href}"
-                    clean_url = job_url.split("?")[0]
 
-                    if clean_url in applied_history:
-                        run_log["skipped_jobs"].append({"title": title, "url": clean_url, "reason": "already history", "keyword": ""})
-                        continue
-                
-                    is_valid, matched_kw = is_job_valid(title, "", exclude_list, keyword)
-                    if not is_valid:
-                        console.print(f"[yellow]  Skip (title filter): {title}[/yellow]")
-                        run_log["skipped_jobs"].append({"title": title, "url": clean_url, "reason": "title filter", "keyword": matched_kw})
-                        continue
+async def open_query(context: BrowserContext, query: SearchQuery, discovery: str, checkpoint: Checkpoint) -> None:
+    """
+    Set up a query's batch source: the search API if asked for and reachable, else its
+    own SERP tab, starting from the checkpointed results page.
+    """
+    is_recommendation_mode = not query.keyword.strip()
+    query.search_url = search_url_for(query.keyword, query.location)
+
+    if discovery == "api" and is_recommendation_mode:
+        console.print("[yellow]API discovery needs a keyword; using the homepage instead.[/yellow]")
+    elif discovery == "api":
+        client = JobSearchClient(cookies_from_context(await context.cookies()))
+        start_page = checkpoint.start_page("api", query.search_url)
+        try:
+            with TIMER.stage("discover"):
+                first = await asyncio.to_thread(client.search_page, query.keyword, query.location, start_page)
+            console.print(f"[cyan]Discovering {query.label} via search API ({first[1]} matches)[/cyan]")
+            query.batches = api_batches(client, query.keyword, query.location, first, start_page)
+            query.source = "api"
+            return
+        except Exception as e:
+            console.print(f"[yellow]Search API unavailable ({e}); falling back to the SERP.[/yellow]")
+            client.close()
 
-                    console.print(f"\n[cyan]→ {title}[/cyan]")
+    main_page: Page = await context.new_page()
+    query.source = "serp"
+    start_page = 1 if is_recommendation_mode else checkpoint.start_page(query.source, query.search_url)
+    start_url = query.search_url if start_page == 1 else f"{query.search_url}&page={start_page}"
 
-                    job_page: Page = await context.new_page()
-                    try:
-                        await job_page.goto(job_url, timeout=45000, wait_until="domcontentloaded")
-                        try:
-                            await job_page.wait_for_selector('a[data-automation="job-detail-apply"], div[data-automation="jobAdDetails"]', timeout=8000)
-                        except Exception:
-                            pass
-                    except Exception as e:
-                        console.print(f"  [red]Load failed: {e}[/red]")
-                        await job_page.close()
-                        continue
+    if is_recommendation_mode:
+        console.print(f"[magenta]Recommendation Mode Active (Homepage)[/magenta]")
+    console.print(f"[cyan]Navigating to {start_url}[/cyan]")
 
-                    # Scrape metadata for logging and location filtering
-                    loc_text, sal_text = "Unknown", "Hidden"
-                    try:
-                        loc_el = job_page.locator("[data-automation='job-detail-location']")
-                        if await loc_el.count():
-                            loc_text = await loc_el.first.inner_text()
-                        sal_el = job_page.locator("[data-automation='job-detail-salary']")
-                        if await sal_el.count():
-                            sal_text = await sal_el.first.inner_text()
-                    except Exception:
-                        pass
+    await main_page.goto(start_url, wait_until="domcontentloaded")
+    try:
+        await main_page.wait_for_selector(JOB_LIST_SELECTOR, timeout=10000)
+    except Exception:
+        pass
+    query.batches = serp_batches(main_page, is_recommendation_mode, start_page)
+
+
+async def ensure_logged_in(context: BrowserContext) -> None:
+    """Open the homepage and, if the session has expired, wait for the user to log in."""
+    # Reliable login check: look for a user-specific nav element in the DOM
+    # The profile/avatar link only renders when a session exists
+    check_page: Page = await context.new_page()
+    console.print("[dim]Checking login status...[/dim]")
+    await check_page.goto("https://id.jobstreet.com", wait_until="domcontentloaded", timeout=20000)
+    await check_page.wait_for_timeout(2000)
+
+    # Check for login button (shown when logged out) vs profile icon (shown when logged in)
+    login_btn_visible = await check_page.locator("a[href*='/id/login'], a:has-text('Masuk')").count()
+    is_logged_out = login_btn_visible > 0 or "login" in check_page.url or "accounts.google" in check_page.url
+
+    if is_logged_out:
+        console.print("\n[bold yellow]═══ LOGIN REQUIRED ═══[/bold yellow]")
+        console.print("Please log in to JobStreet in the browser window (use Google, etc.)")
+        console.print("[dim]The script will continue automatically once you're logged in.[/dim]")
+        # Wait until user is on a jobstreet page that isn't login
+        with TIMER.stage("login_wait", human=True):
+            await check_page.wait_for_url(
+                lambda url: "jobstreet.com" in url
+                    and "login" not in url
+                    and "masuk" not in url
+                    and "accounts.google" not in url
+                    and "seek.com/login" not in url,
+                timeout=0
+            )
+        await check_page.wait_for_timeout(2000)
+        console.print("[bold green]✓ Logged in! Starting automation...[/bold green]")
+    else:
+        console.print("[green]✓ Already logged in.[/green]")
 
-                    # Enforce strict location check (JobStreet sometimes injects recommended jobs outside the search area)
-                    if location and location.lower() not in loc_text.lower() and loc_text != "Unknown":
-                        console.print(f"  [yellow]Skip (location filter): {loc_text}[/yellow]")
-                        run_log["skipped_jobs"].append({"title": title, "url": clean_url, "reason": "location filter", "keyword": loc_text})
-                        await job_page.close()
-                        continue
+    await check_page.close()
 
-                    # Check description keywords
-                    try:
-                        desc_el = job_page.locator("div[data-automation='jobAdDetails']")
-                        if await desc_el.count():
-                            desc = await desc_el.first.inner_text()
-                            is_valid, matched_kw = is_job_valid(title, desc, exclude_list, keyword)
-                            if not is_valid:
-                                console.print("  [yellow]Skip (desc filter)[/yellow]")
-                                run_log["skipped_jobs"].append({"title": title, "url": clean_url, "reason": "desc filter", "keyword": matched_kw})
-                                await job_page.close()
-                                continue
-                    except Exception:
-                        pass
 
-                    # Find Apply button
-                    try:
-                        pages_before = len(context.pages)
-                        apply_btn = job_page.locator('a[data-automation="job-detail-apply"]')
-
-                        # Skip external applications
-                        if await job_page.locator('a[data-automation="job-detail-apply-external"]').count():
-                            console.print("  [dim]Skip (external)[/dim]")
-                            run_log["skipped_jobs"].append({"title": title, "url": clean_url, "reason": "external application", "keyword": ""})
-                            await job_page.close()
-                            continue
+async def run(keyword: str, location: str, exclude_list: List[str], max_apps: int, dry_run: bool, auto_mode: str,
+              concurrency: int = EVAL_CONCURRENCY, block_resources: bool = True, discovery: str = "serp",
+              har_record: Optional[str] = None, har_replay: Optional[str] = None, headless: bool = False,
+              queries: Optional[List[Tuple[str, str]]] = None, park_unknown: bool = False) -> Dict:
+    """
+    Main application loop to search for jobs and apply.
+    Uses Playwright's persistent context to reuse an existing Chrome profile
+    for logged-in sessions.
 
-                        if not await apply_btn.count():
-                            # Fallback - look for a Quick Apply button that isn't external
-                            apply_btn = job_page.locator("button:has-text('Lamaran Cepat'), button:has-text('Apply')")
+    queries is a list of (keyword, location) searches run round-robin in the same
+    session (see query_scheduler.py); without it the run is the single
+    (keyword, location) search.
+
+    park_unknown puts jobs with questions that would need a prompt into the pending
+    queue (pending_queue.py) instead of waiting; before every results page, answers given
+    from its CLI are imported and the jobs they unblock are re-opened and finished.
+
+    har_record saves the browser's traffic to a HAR (.zip) file; har_replay serves a
+    recorded HAR back through route_from_har in a clean context with no network, no
+    profile and an in-memory history, so the same run can be repeated offline. Both
+    force a dry run and SERP discovery (the search API isn't browser traffic). A replay
+    also reads the answer bank into memory and never writes it back, parks unknown
+    questions instead of prompting and skips the Semi-Auto override window, so every
+    round runs unattended and sees the same answers.
+    Returns the run's summary and throughput numbers.
+    """
+    if har_record or har_replay:
+        if not dry_run:
+            console.print("[yellow]HAR record/replay always runs as a dry run.[/yellow]")
+        dry_run = True
+        discovery = "serp"
+    if har_replay:
+        global _answer_bank
+        _answer_bank = AnswerBank(QUESTIONS_FILE, persist=False)
+        park_unknown = True
+        auto_mode = "Fully"
+
+    answers_db = QuestionIndex(load_answers(), types=get_answer_bank().types())
+    # A replay must not skip jobs because an earlier replay "applied" to them
+    applied_history = HistoryStore(":memory:", markdown_path=None) if har_replay else HistoryStore()
+    job_cache = JobCache(":memory:") if har_replay else JobCache()
+    pending = PendingQueue(":memory:") if har_replay else PendingQueue()
+    queries = queries or [(keyword, location)]
+    search_queries = [SearchQuery(kw, loc, ExclusionMatcher(exclude_list, kw)) for kw, loc in queries]
+    # Same key as a single-search run when there is only one query
+    checkpoint = Checkpoint(settings_key(";".join(kw for kw, _ in queries), ";".join(loc for _, loc in queries), exclude_list),
+                            path=None if har_replay else CHECKPOINT_FILE)
+    console.print(f"[green]Questions bank: {len(answers_db)} | History: {len(applied_history)}[/green]")
+    if checkpoint.resumed:
+        pages = ", ".join(f"{pos['source'] or 'serp'} page {pos['page_no']}" for pos in checkpoint.positions.values())
+        console.print(f"[cyan]Resuming checkpoint: {len(checkpoint)} jobs already judged ({pages or 'no pages yet'})[/cyan]")
 
-                        if not await apply_btn.count():
-                            console.print("  [dim]Skip (no apply button)[/dim]")
-                            run_log["skipped_jobs"].append({"title": title, "url": clean_url, "reason": "no apply button", "keyword": ""})
-                            await job_page.close()
-                            continue
+    import datetime
+    start_time = datetime.datetime.now()
+    run_timestamp = start_time.strftime("%Y-%m-%d_%H-%M-%S")
+    run_log = RunLogger(run_timestamp, {
+        "start_time": start_time.isoformat(),
+        "keyword": keyword,
+        "location": location,
+        "queries": [list(q) for q in queries],
+        "exclude_list": exclude_list,
+        "max_apps": max_apps,
+        "dry_run": dry_run,
+        "auto_mode": auto_mode,
+        "concurrency": concurrency,
+        "block_resources": block_resources,
+        "discovery": discovery,
+        "har_record": har_record,
+        "har_replay": har_replay,
+        "park_unknown": park_unknown,
+        "resumed_checkpoint": checkpoint.resumed
+    })
+    TIMER.reset(sink=run_log.stage)
+    run_t0 = time.monotonic()
+    network_policy = NetworkPolicy()
+    navigations = 0
+    first_job_s: Optional[float] = None
+    apps_done = 0
+    parked_jobs = 0
+    stats: Dict = {}
+
+    def count_navigation(request) -> None:
+        nonlocal navigations
+        if request.is_navigation_request():
+            navigations += 1
+
+    async def apply_candidate(cand: Dict, query: Optional[SearchQuery]) -> None:
+        """The serial apply stage for one candidate (it may prompt the user), plus its bookkeeping."""
+        nonlocal apps_done, parked_jobs
+        with TIMER.stage("apply", job_id=cand["job_id"]):
+            job_log = await apply_to_job(cand, answers_db, dry_run, auto_mode, park_unknown)
+        if cand.get("parked"):
+            parked_jobs += 1
+            pending.park(cand, cand["parked"])
+            checkpoint.record(cand["job_id"], "parked")
+            run_log.event("parked", job_id=cand["job_id"], title=cand["title"], url=cand["clean_url"],
+                          questions=cand["parked"])
+            return
+        pending.resolve(cand["job_id"])
+        checkpoint.record(cand["job_id"], "applied" if job_log else "failed")
+
+        if job_log:
+            apps_done += 1
+            if query is not None:
+                query.stats["applied"] += 1
+            run_log.apply(job_log)
+            applied_history.record(cand["title"], cand["clean_url"], location=cand["loc_text"],
+                                   salary=cand["sal_text"], dry_run=dry_run, run_id=run_timestamp)
+            if max_apps >= 999999:
+                console.print(f"  [cyan]Logged ({apps_done})[/cyan]")
+            else:
+                console.print(f"  [cyan]Logged ({apps_done}/{max_apps})[/cyan]")
+
+    async def retry_parked() -> None:
+        """Import answers given from the pending-queue CLI, then finish the parked jobs they unblock."""
+        for a in pending.take_answers():
+            answers_db.add(a["text"], a["answer"], a["type"])
+            append_question(a["text"], a["type"], a["answer"], a["options"] or None)
+            console.print(f"[green]Answer from the pending queue: '{a['text'][:60]}' → '{a['answer']}'[/green]")
+        for job in pending.ready(lambda q, q_type, opts: answers_db.lookup(q, opts, q_type) is not None):
+            if apps_done >= max_apps:
+                return
+            if job["attempts"] >= PARK_MAX_ATTEMPTS:
+                console.print(f"[yellow]Giving up on parked job after {job['attempts']} tries: {job['title']}[/yellow]")
+                pending.resolve(job["job_id"])
+                checkpoint.record(job["job_id"], "failed")
+                continue
+            console.print(f"[cyan]Re-opening parked job: {job['title']}[/cyan]")
+            cand = await reopen_parked(context, job)
+            if cand is None:
+                pending.resolve(job["job_id"])
+                checkpoint.record(job["job_id"], "failed")
+                continue
+            await apply_candidate(cand, None)
 
-                        btn_text = await apply_btn.first.inner_text()
-                        if "situs" in btn_text.lower() or "site" in btn_text.lower():
-                            console.print("  [dim]Skip (external site)[/dim]")
-                            run_log["skipped_jobs"].append({"title": title, "url": clean_url, "reason": "external site text", "keyword": ""})
-                            await job_page.close()
+    try:
+        async with async_playwright() as pw:
+            # browser-automation skill: dedicated Playwright profile
+            # - No conflict with real Chrome (separate profile dir)
+            # - Session is SAVED after first login: no re-login needed on next run
+            # - First run only: browser opens, user logs in manually, presses Enter
+            console.print("[dim]Launching browser...[/dim]")
+            if har_replay:
+                browser = await pw.chromium.launch(headless=headless, slow_mo=30,
+                                                   args=["--disable-blink-features=AutomationControlled"])
+                context: BrowserContext = await browser.new_context(viewport={"width": 1280, "height": 900})
+                await context.route_from_har(har_replay, not_found="abort")
+                console.print(f"[magenta]Replaying {har_replay} (offline)[/magenta]")
+            else:
+                if os.name == "nt" and os.path.exists(os.path.join(PLAYWRIGHT_PROFILE, "lockfile")):
+                    # A Chrome left over from a crashed run still holds the profile
+                    import subprocess
+                    subprocess.run(["taskkill", "/F", "/IM", "chrome.exe", "/T"], capture_output=True)
+                    await asyncio.sleep(1)
+
+                har_kwargs = {"record_har_path": har_record, "record_har_mode": "full"} if har_record else {}
+                context: BrowserContext = await pw.chromium.launch_persistent_context(
+                    user_data_dir=PLAYWRIGHT_PROFILE,
+                    headless=headless,
+                    slow_mo=30,
+                    viewport={"width": 1280, "height": 900},
+                    args=["--disable-blink-features=AutomationControlled"],
+                    **har_kwargs,
+                )
+                if har_record:
+                    console.print(f"[magenta]Recording traffic to {har_record}[/magenta]")
+            context.on("request", count_navigation)
+            if block_resources:
+                # Images, fonts, media and trackers are never needed to filter or apply
+                await network_policy.install(context)
+
+            if not har_replay:
+                # Fast start: trust the profile's auth cookies if they match the last confirmed login
+                valid, why = check_session(await context.cookies(), load_reference())
+                if valid:
+                    console.print(f"[green]✓ Already logged in ({why}).[/green]")
+                else:
+                    console.print(f"[dim]Session check: {why}[/dim]")
+                    await ensure_logged_in(context)
+                    await context.storage_state(path=SESSION_STATE_FILE)
+            TIMER.record("startup", time.monotonic() - run_t0)
+
+            for query in search_queries:
+                await open_query(context, query, discovery, checkpoint)
+            batches = round_robin(search_queries)
+
+            console.print("[bold]Scanning for jobs...[/bold]\n")
+            if len(pending):
+                console.print(f"[dim]{len(pending)} parked job(s) waiting for answers[/dim]")
+
+            async for query, page_no, unique in batches:
+                if first_job_s is None and unique:
+                    first_job_s = time.monotonic() - run_t0
+                    console.print(f"[dim]  First jobs after {first_job_s:.1f}s[/dim]")
+                if len(search_queries) > 1:
+                    console.print(f"[cyan]{query.label}, page {page_no}[/cyan]")
+                checkpoint.set_position(query.source, query.search_url, page_no)
+                await retry_parked()
+                # Card-level filter first — only survivors get a detail page
+                batch: List[Dict] = []
+                for job_id, card in unique.items():
+                    href = card["href"]
+                    job_url = href if href.startswith("http") else f"https://id.jobstreet.com{href}"
+                    job = {**card, "job_url": job_url, "clean_url": job_url.split("?")[0]}
+                    run_log.job_seen(job_id, job["title"], job["clean_url"])
+
+                    if job_id in checkpoint:
+                        # Judged before the restart: never fetched again
+                        run_log.skip(job["title"], job["clean_url"], "already judged", checkpoint.verdicts[job_id]["verdict"])
+                        continue
+                    reason, matched_kw = card_skip_reason(job, query.location, query.matcher, applied_history)
+                    if reason:
+                        if reason != "already history":
+                            console.print(f"[yellow]  Skip ({reason}): {job['title']}[/yellow]")
+                        run_log.skip(job["title"], job["clean_url"], reason, matched_kw)
+                        checkpoint.record(job_id, "skipped", reason)
+                        continue
+                    batch.append(job)
+                query.stats["passed_card"] += len(batch)
+
+                console.print(f"[dim]  {len(batch)}/{len(unique)} passed the card filter[/dim]")
+                if batch and apps_done < max_apps:
+                    # Producer/consumer: workers prefetch + filter detail pages concurrently,
+                    # the apply stage below stays serial because it may prompt the user.
+                    jobs_q: asyncio.Queue = asyncio.Queue()
+                    for job in batch:
+                        jobs_q.put_nowait(job)
+                    cand_q: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+                    workers = [
+                        asyncio.create_task(_evaluation_worker(context, jobs_q, cand_q, query.location, query.matcher,
+                                                              run_log, checkpoint, job_cache))
+                        for _ in range(min(concurrency, len(batch)))
+                    ]
+                    closer = asyncio.create_task(_close_when_done(workers, cand_q))
+
+                    while True:
+                        with TIMER.stage("queue_wait"):
+                            cand = await cand_q.get()
+                        if cand is None:
+                            break
+                        query.stats["passed_detail"] += 1
+                        if apps_done >= max_apps:
+                            await cand["page"].close()
                             continue
 
-                        console.print("  [magenta]Applying...[/magenta]")
-                        await safe_click(apply_btn.first)
-                        try:
-                            await job_page.wait_for_load_state("domcontentloaded", timeout=5000)
-                        except Exception:
-                            pass
-
-                        # Handle application in new tab vs same page
-                        apply_page = context.pages[-1] if len(context.pages) > pages_before else job_page
-                        new_tab = apply_page != job_page
-                        if new_tab:
-                            await apply_page.bring_to_front()
-
-                        job_log = {
-                            "title": title,
-                            "url": clean_url,
-                            "location": loc_text,
-                            "salary": sal_text,
-                            "questions": []
-                        }
-                        success = await navigate_form(apply_page, answers_db, title, dry_run, auto_mode, job_log)
-
-                        if success:
-                            apps_done += 1
-                            run_log["applied_jobs"].append(job_log)
-                            applied_history.add(clean_url)
-                            log_applied_job(title, clean_url, sal_text, loc_text, dry_run)
-                            if max_apps >= 999999:
-                                console.print(f"  [cyan]Logged ({apps_done})[/cyan]")
-                            else:
-                                console.print(f"  [cyan]Logged ({apps_done}/{max_apps})[/cyan]")
-
-                        if new_tab:
-                            await apply_page.close()
-                        await job_page.close()
-
-                    except Exception as e:
-                        console.print(f"  [red]Apply error: {e}[/red]")
-                        try:
-                            await job_page.close()
-                        except Exception:
-                            pass
-
-                # Paginate or Refresh
-                if is_recommendation_mode:
-                    console.print("[dim]Checking for fresh recommendations...[/dim]")
-                    await main_page.reload(wait_until="domcontentloaded")
-                    try:
-                        await main_page.wait_for_selector('article[data-automation="normalJob"], a[data-automation^="recommendedJobLink_"]', timeout=10000)
-                    except Exception:
-                        pass
-                else:
-                    next_btn = main_page.get_by_role("link", name=re.compile(r"(Selanjutnya|Next)", re.IGNORECASE))
-                    if await next_btn.count():
-                        await safe_click(next_btn.first)
-                        try:
-                            await main_page.wait_for_selector('article[data-automation="normalJob"]', state="attached", timeout=10000)
-                        except Exception:
-                            pass
-                    else:
-                        console.print("[dim]End of pages.[/dim]")
-                        break
+                        await apply_candidate(cand, query)
+                        if apps_done >= max_apps:
+                            for w in workers:
+                                w.cancel()
+                    await closer
+
+                if apps_done >= max_apps:
+                    break
+            else:
+                # Every result was judged: the next run starts from the top again
+                checkpoint.clear()
+            await batches.aclose()
 
             console.print(f"\n[bold green]Done! Applied to {apps_done} jobs.[/bold green]")
+            # Also where a recorded HAR gets written out
             await context.close()
         
     finally:
-        # Save detailed log on graceful finish or crash
-        run_log["settings"]["end_time"] = datetime.datetime.now().isoformat()
-        import os
-        os.makedirs("automaton/logs", exist_ok=True)
-        log_path = f"automaton/logs/{run_timestamp}.json"
-        with open(log_path, "w", encoding="utf-8") as f:
-            json.dump(run_log, f, indent=4, ensure_ascii=False)
-        console.print(f"[bold cyan]Detailed run log saved to: {log_path}[/bold cyan]")
+        # Close the event stream on graceful finish or crash (a hard kill keeps what was flushed)
+        wall_s = time.monotonic() - run_t0
+        human_s = TIMER.human_seconds()
+        auto_min = (wall_s - human_s) / 60
+        detail_pages = len(TIMER.samples.get("load", []))
+        extra = {
+            "timings": TIMER.summary(),
+            "throughput": {
+                "wall_s": round(wall_s, 1),
+                "human_s": round(human_s, 1),
+                "automated_s": round(wall_s - human_s, 1),
+                "apps_per_automated_min": round(run_log.applied / auto_min, 2) if auto_min > 0 else 0.0,
+                "jobs_per_automated_min": round(detail_pages / auto_min, 2) if auto_min > 0 else 0.0,
+                "navigations": navigations,
+                "pages_per_job": round(navigations / detail_pages, 2) if detail_pages else 0.0,
+                "time_to_first_job_s": round(first_job_s, 2) if first_job_s is not None else None,
+            },
+        }
+        if block_resources:
+            extra["network"] = net = network_policy.stats()
+            console.print(f"[dim]  Blocked {net['blocked']} requests (~{net['est_bytes_saved'] / 1e6:.1f} MB saved), allowed {net['allowed']}[/dim]")
+        extra["queries"] = [q.summary() for q in search_queries]
+        if len(search_queries) > 1:
+            console.print(yield_table(search_queries))
+        extra["pending"] = {"parked": parked_jobs, "waiting": len(pending)}
+        if parked_jobs or len(pending):
+            console.print(f"[yellow]  Parked {parked_jobs} job(s) this run; {len(pending)} waiting for answers "
+                          f"(python automaton/pending_queue.py)[/yellow]")
+        extra["job_cache"] = cache_stats = job_cache.stats()
+        console.print(f"[dim]  Job cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                      f"{cache_stats['entries']} entries[/dim]")
+        applied_history.close()
+        job_cache.close()
+        pending.close()
+        get_answer_bank().close()
+        if har_replay:
+            _answer_bank = None  # the next run in this process reads the real bank again
+        checkpoint.save()
+        console.print(TIMER.table())
+        tp = extra["throughput"]
+        console.print(f"[dim]  Wall {tp['wall_s']:.0f}s, waiting on you {tp['human_s']:.0f}s, "
+                      f"automated {tp['automated_s']:.0f}s ({tp['apps_per_automated_min']} applications/min)[/dim]")
+        summary = run_log.close(**extra)
+        stats = {**summary, **extra["throughput"], "log_path": run_log.path}
+        console.print(f"[dim]  Seen {summary['jobs_seen']} jobs, skipped {summary['unique_skipped']} "
+                      f"({summary['repeat_skips']} repeat skips not re-logged)[/dim]")
+        console.print(f"[bold cyan]Detailed run log saved to: {run_log.path}[/bold cyan]")
+    return stats
 
 # ---------------------------------------------------------------------------
 # Entry Point
@@ -1065,18 +1991,21 @@ async def run(keyword: str, location: str, exclude_list: List[str], max_apps: in
 def main() -> None:
     console.print("\n[bold cyan]JobStreet Auto-Applier[/bold cyan]\n")
 
-    keyword = Prompt.ask("Job keyword", default="")
-    location = Prompt.ask("Location", default="Jakarta")
+    keyword = Prompt.ask("Job keyword(s) (comma-separated)", default="")
+    location = Prompt.ask("Location(s) (comma-separated)", default="Jakarta")
     extra_excl = Prompt.ask("Extra exclude keywords (comma-separated)", default="akutansi, math, matematika, mathematic, dosen, echonomic, principal, christian, christiann, kristen, religious, religion, agama, china, chinese, mandarin, toddler, todly, toddly, tk, kindergarden, bayi, baby, musik, seni, renang, music, singing, sport, dancing, public speaking, economic")
     max_str = Prompt.ask("Max applications (type ALL for no limit)", default="ALL")
     
-    console.print("\n[bold]Mode Selection (For new 'How many years' questions)[/bold]")
+    console.print("\n[bold]Mode Selection (For years/salary/notice questions answered from automaton/profile.json)[/bold]")
     console.print("  1. [cyan]Semi-Auto[/cyan] (Waits 2s for manual input before auto-answering)")
     console.print("  2. [magenta]Fully Auto[/magenta] (Instantly answers to keep the scraper running at max speed)")
     mode_raw = Prompt.ask("Choose mode", choices=["1", "2"], default="2")
     auto_mode = "Semi" if mode_raw == "1" else "Fully"
     
+    park_raw = Prompt.ask("Park jobs with unknown questions and answer later? (y/N)", default="N")
     dry = Prompt.ask("Dry run? (Y/n)", default="Y")
+    conc_str = Prompt.ask("Job pages to evaluate in parallel", default=str(EVAL_CONCURRENCY))
+    discovery = Prompt.ask("Find jobs via", choices=["serp", "api"], default="serp")
 
     exclude_list = KEYWORDS_TO_EXCLUDE.copy()
     if extra_excl.strip():
@@ -1095,13 +2024,23 @@ def main() -> None:
             max_display = "ALL"
 
     is_dry = dry.strip().lower() not in ("n", "no", "false")
+    park_unknown = park_raw.strip().lower() in ("y", "yes", "true")
+    try:
+        concurrency = max(1, int(conc_str))
+    except ValueError:
+        concurrency = EVAL_CONCURRENCY
 
+    queries = parse_queries(keyword, location)
     console.print(f"\n[magenta]Keyword:[/magenta] {keyword}  [magenta]Location:[/magenta] {location}")
+    if len(queries) > 1:
+        labels = ", ".join(f"{kw or '(homepage)'} @ {loc}" for kw, loc in queries)
+        console.print(f"[dim]{len(queries)} searches, taken in turns: {labels}[/dim]")
     console.print(f"[dim]Excludes: {', '.join(exclude_list[:5])}{'...' if len(exclude_list) > 5 else ''}[/dim]")
-    console.print(f"[dim]Dry run: {is_dry} | Max: {max_display} | Auto: {auto_mode}[/dim]\n")
+    console.print(f"[dim]Dry run: {is_dry} | Max: {max_display} | Auto: {auto_mode} | Parallel: {concurrency} | Discovery: {discovery} | Park: {park_unknown}[/dim]\n")
 
     try:
-        asyncio.run(run(keyword, location, exclude_list, max_apps, is_dry, auto_mode))
+        asyncio.run(run(keyword, location, exclude_list, max_apps, is_dry, auto_mode, concurrency,
+                        discovery=discovery, queries=queries, park_unknown=park_unknown))
     except KeyboardInterrupt:
         console.print("\n[red]Stopped by user.[/red]")
 
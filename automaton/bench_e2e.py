@@ -0,0 +1,95 @@
+"""
+End-to-end throughput benchmark on recorded traffic.
+
+record: one real dry run through run(har_record=...), saving the browser traffic to a
+        HAR zip plus a <har>.json sidecar with the run's settings.
+replay: the same run against the HAR only (route_from_har, no network, headless),
+        N rounds, reporting jobs evaluated per minute, applications per minute and
+        pages per job. Every round is appended to automaton/logs/bench_e2e.jsonl with
+        the git revision, so numbers can be compared between versions.
+
+Usage:
+  python automaton/bench_e2e.py record <run.har.zip> <keyword> [location] [max_apps]
+  python automaton/bench_e2e.py replay <run.har.zip> [--rounds N]
+"""
+import asyncio
+import datetime
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from apply_jobs import KEYWORDS_TO_EXCLUDE, run
+
+console = Console()
+
+RESULTS_FILE = "automaton/logs/bench_e2e.jsonl"
+ROUNDS = 3
+
+
+def _git_rev() -> str:
+    try:
+        out = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def record(har_path: str, keyword: str, location: str, max_apps: int) -> None:
+    settings = {"keyword": keyword, "location": location, "exclude_list": KEYWORDS_TO_EXCLUDE.copy(),
+                "max_apps": max_apps, "auto_mode": "Fully"}
+    stats = asyncio.run(run(settings["keyword"], settings["location"], settings["exclude_list"],
+                            settings["max_apps"], True, settings["auto_mode"], har_record=har_path))
+    with open(har_path + ".json", "w", encoding="utf-8") as f:
+        json.dump({"settings": settings, "recorded": stats}, f, indent=4, ensure_ascii=False)
+    console.print(f"[green]Recorded {har_path} ({stats.get('jobs_seen', 0)} jobs seen)[/green]")
+
+
+def replay(har_path: str, rounds: int) -> None:
+    with open(har_path + ".json", "r", encoding="utf-8") as f:
+        settings = json.load(f)["settings"]
+    rev = _git_rev()
+
+    results: List[Dict] = []
+    for i in range(rounds):
+        console.print(f"\n[bold]Replay round {i + 1}/{rounds}[/bold]")
+        stats = asyncio.run(run(settings["keyword"], settings["location"], settings["exclude_list"],
+                                settings["max_apps"], True, settings["auto_mode"],
+                                har_replay=har_path, headless=True))
+        results.append(stats)
+        with open(RESULTS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": datetime.datetime.now().isoformat(timespec="seconds"), "rev": rev,
+                                "har": har_path, "round": i + 1, **stats}, ensure_ascii=False) + "\n")
+
+    table = Table(title=f"End-to-end replay @ {rev} ({rounds} rounds)")
+    table.add_column("metric")
+    table.add_column("median", justify="right")
+    table.add_column("min", justify="right")
+    table.add_column("max", justify="right")
+    for key in ("wall_s", "automated_s", "jobs_per_automated_min", "apps_per_automated_min",
+                "pages_per_job", "time_to_first_job_s", "jobs_seen", "total_applied"):
+        values = [r.get(key) or 0 for r in results]
+        table.add_row(key, f"{statistics.median(values):.2f}", f"{min(values):.2f}", f"{max(values):.2f}")
+    console.print(table)
+    console.print(f"[dim]Rounds appended to {RESULTS_FILE}[/dim]")
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if args[:1] == ["record"] and len(args) >= 3:
+        location = args[3] if len(args) > 3 else "Jakarta"
+        max_apps = int(args[4]) if len(args) > 4 else 5
+        record(args[1], args[2], location, max_apps)
+    elif args[:1] == ["replay"] and len(args) >= 2:
+        rounds = int(args[args.index("--rounds") + 1]) if "--rounds" in args else ROUNDS
+        replay(args[1], rounds)
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
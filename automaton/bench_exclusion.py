@@ -0,0 +1,124 @@
+"""
+Microbenchmark: ExclusionMatcher vs the original per-call is_job_valid.
+
+Titles and exclusion lists come from the saved run logs (automaton/logs/*.json[l]).
+The logs don't keep job descriptions, so the description corpus is the visible
+text of saved pages (debug_loop.html by default, or any .html/.txt passed on the
+command line).
+
+Usage:
+  python automaton/bench_exclusion.py [page.html ...]
+"""
+import html
+import re
+import sys
+import timeit
+from typing import List, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from apply_jobs import ExclusionMatcher, KEYWORDS_TO_EXCLUDE
+from run_logger import LOGS_DIR, read_run_log, run_log_paths
+
+console = Console()
+
+DEFAULT_PAGES = ["debug_loop.html"]
+
+
+def legacy_is_job_valid(title: str, description: str, exclude_list: List[str], search_keyword: str = "") -> Tuple[bool, str]:
+    """Verbatim copy of is_job_valid before the matcher — rebuilds a regex per keyword per call."""
+    text = f"{title} {description}".lower()
+    for kw in exclude_list:
+        kw = kw.strip()
+        if not kw:
+            continue
+        pattern = kw if kw.startswith(r"\b") else rf"\b{re.escape(kw)}\b"
+        if re.search(pattern, text):
+            return False, kw
+    if search_keyword and search_keyword.strip():
+        k_low = search_keyword.strip().lower()
+        t_low = title.lower()
+        if "guru" in k_low:
+            valid_words = ["guru", "teacher", "tutor", "pengajar", "lecturer", "educator", "dosen", "pendidik", "instructor", "fasilitator"]
+            if not any(w in t_low for w in valid_words):
+                return False, f"drifted missing {k_low}"
+        else:
+            words = k_low.split()
+            if words and not any(w in t_low for w in words):
+                return False, f"drifted missing {k_low}"
+    return True, ""
+
+
+def page_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    if path.endswith((".html", ".htm")):
+        raw = re.sub(r"<(script|style)[^>]*>.*?</\1>", " ", raw, flags=re.S)
+        raw = html.unescape(re.sub(r"<[^>]+>", " ", raw))
+    return " ".join(raw.split())
+
+
+def load_corpus(pages: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    titles: List[str] = []
+    exclude_list: List[str] = list(KEYWORDS_TO_EXCLUDE)
+    for path in run_log_paths():
+        log = read_run_log(path)
+        exclude_list = log.get("settings", {}).get("exclude_list") or exclude_list
+        for job in log.get("applied_jobs", []) + log.get("skipped_jobs", []):
+            if job.get("title"):
+                titles.append(job["title"])
+    descriptions = [page_text(p) for p in pages]
+    return titles, descriptions, exclude_list
+
+
+def main() -> None:
+    pages = sys.argv[1:] or DEFAULT_PAGES
+    titles, descriptions, exclude_list = load_corpus(pages)
+    if not titles:
+        console.print(f"[red]No titles found in {LOGS_DIR}[/red]")
+        return
+    keyword = "guru"
+    calls = [(t, "") for t in titles] + [(t, d) for t in titles for d in descriptions]
+    console.print(f"[dim]{len(titles)} titles, {len(descriptions)} descriptions, "
+                  f"{len(exclude_list)} exclusions ({len(set(exclude_list))} unique), {len(calls)} calls/round[/dim]")
+
+    # Same verdicts (the reported keyword may differ when several match: the matcher
+    # reports the leftmost hit in the text, the legacy loop the first in list order)
+    matcher = ExclusionMatcher(exclude_list, keyword)
+    mismatches = [(t, d[:40]) for t, d in calls
+                  if matcher.check(t, d)[0] != legacy_is_job_valid(t, d, exclude_list, keyword)[0]]
+    if mismatches:
+        console.print(f"[red]{len(mismatches)} verdict mismatches, e.g. {mismatches[:3]}[/red]")
+
+    # Rejected texts usually stop at an early keyword; accepted ones (the jobs we
+    # actually apply to) pay for every keyword, so time them separately
+    accepted = [c for c in calls if legacy_is_job_valid(c[0], c[1], exclude_list, keyword)[0]]
+    accepted_desc = [c for c in calls if c[1] and not matcher.excluded_keyword(f"{c[0]} {c[1]}".lower())]
+    if not accepted_desc:
+        # The sample pages mention excluded words; scrub them to time the full scan
+        scrub = re.compile("|".join(re.escape(k) for k in matcher.keywords if not k.startswith(r"\b")))
+        accepted_desc = [(t, scrub.sub("x", d)) for t, d in calls if d][:len(descriptions) * 20]
+
+    table = Table(title="is_job_valid microbenchmark")
+    table.add_column("calls")
+    table.add_column("n", justify="right")
+    table.add_column("legacy / call", justify="right")
+    table.add_column("matcher / call", justify="right")
+    table.add_column("speed-up", justify="right")
+    for name, subset in (("all", calls), ("accepted", accepted), ("description scan, no hit", accepted_desc)):
+        if not subset:
+            continue
+        legacy = min(timeit.repeat(lambda: [legacy_is_job_valid(t, d, exclude_list, keyword) for t, d in subset],
+                                   number=5, repeat=3)) / 5 / len(subset)
+        new = min(timeit.repeat(lambda: [matcher.check(t, d) for t, d in subset],
+                                number=5, repeat=3)) / 5 / len(subset)
+        table.add_row(name, str(len(subset)), f"{legacy * 1e6:.1f} µs", f"{new * 1e6:.1f} µs", f"{legacy / new:.1f}x")
+    console.print(table)
+
+    build = min(timeit.repeat(lambda: ExclusionMatcher(exclude_list, keyword), number=20, repeat=3)) / 20
+    console.print(f"[dim]Matcher build (once per run): {build * 1e6:.0f} µs[/dim]")
+
+
+if __name__ == "__main__":
+    main()
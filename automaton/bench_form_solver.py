@@ -0,0 +1,200 @@
+"""
+Offline benchmark and regression check for the form solver.
+
+Saved apply-step pages (automaton/fixtures/form_steps.json lists each HTML file with
+the questions a person reads on it, and an answer per question) are loaded into
+headless Chromium with page.set_content. Every network request is aborted, so nothing
+reaches the live site. For each fixture get_question_groups and fill_step run as they
+would in navigate_form, and the report shows:
+
+  detection - expected questions found, with the right type and options
+  fill      - the option/value actually selected in the DOM afterwards
+  timing    - p50/p95/max per step: settle wait, snapshot, legacy scan, fills
+
+Exits non-zero when a fixture doesn't match, so it works as a regression check after
+JobStreet changes its markup. A new page (e.g. a fresh debug_loop.html) can be added
+from what the extractor currently sees; check the entry by hand before trusting it:
+
+  python automaton/bench_form_solver.py [fixture ...] [--rounds N]
+  python automaton/bench_form_solver.py capture <page.html> <name>
+"""
+import asyncio
+import json
+import sys
+from typing import Dict, List
+
+from playwright.async_api import Page, Route, async_playwright
+from rich.console import Console
+from rich.table import Table
+
+import apply_jobs
+from apply_jobs import _get_question_groups_legacy, _id_selector, fill_step, get_question_groups
+from stage_timer import TIMER
+
+console = Console()
+
+FIXTURES_FILE = "automaton/fixtures/form_steps.json"
+ROUNDS = 5
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.replace("*", "").split()).lower()
+
+
+def load_fixtures(names: List[str]) -> Dict[str, Dict]:
+    with open(FIXTURES_FILE, "r", encoding="utf-8") as f:
+        fixtures = json.load(f)
+    return {n: fixtures[n] for n in names} if names else fixtures
+
+
+async def _offline(route: Route) -> None:
+    await route.abort()
+
+
+async def selected_labels(page: Page, group: Dict) -> List[str]:
+    """What the DOM shows as chosen for a group right now."""
+    if group["type"] == "Dropdown":
+        label = await page.eval_on_selector(
+            _id_selector(group["label_for"]),
+            "el => el.selectedIndex >= 0 && el.options[el.selectedIndex].value ? el.options[el.selectedIndex].text : ''")
+        return [label.strip()] if label.strip() else []
+    if group["type"] in ("Choice", "MultiChoice"):
+        return [c["label"] for c in group["choices"] if await page.is_checked(_id_selector(c["id"]))]
+    return [await page.input_value(_id_selector(group["label_for"]))]
+
+
+def score_detection(groups: List[Dict], expected: List[Dict]) -> Dict[str, Dict]:
+    """Per expected question: found, type_ok, options_ok."""
+    found = {_norm(g["text"]): g for g in groups}
+    rows = {}
+    for exp in expected:
+        g = found.get(_norm(exp["text"]))
+        rows[exp["text"]] = {
+            "group": g,
+            "found": g is not None,
+            "type_ok": g is not None and g["type"] == exp["type"],
+            "options_ok": g is not None and [o.strip() for o in g["options"]] == exp["options"],
+        }
+    return rows
+
+
+async def run_fixture(page: Page, name: str, fixture: Dict, rounds: int) -> bool:
+    with open(fixture["html"], "r", encoding="utf-8") as f:
+        html = f.read()
+    expected = fixture["questions"]
+    TIMER.reset()
+
+    detection = legacy_detection = None
+    fills: Dict[str, List[str]] = {}
+    for r in range(rounds):
+        await page.set_content(html, wait_until="domcontentloaded")
+        with TIMER.stage("legacy_scan"):
+            legacy_groups = await _get_question_groups_legacy(page)
+
+        await page.set_content(html, wait_until="domcontentloaded")
+        with TIMER.stage("step"):
+            with TIMER.stage("detect"):
+                groups = await get_question_groups(page)
+            rows = score_detection(groups, expected)
+            answers = [(rows[exp["text"]]["group"], exp["answer"]) for exp in expected
+                        if rows[exp["text"]]["group"] is not None and exp.get("answer")]
+            with TIMER.stage("fill"):
+                await fill_step(page, answers)
+        if r == 0:
+            detection = rows
+            legacy_detection = score_detection(legacy_groups, expected)
+            for exp in expected:
+                g = rows[exp["text"]]["group"]
+                fills[exp["text"]] = await selected_labels(page, g) if g is not None else []
+            extra = [g["text"] for g in groups if _norm(g["text"]) not in {_norm(e["text"]) for e in expected}]
+
+    table = Table(title=f"{name} ({fixture['html']})")
+    table.add_column("question")
+    table.add_column("found", justify="center")
+    table.add_column("legacy", justify="center")
+    table.add_column("type", justify="center")
+    table.add_column("options", justify="center")
+    table.add_column("filled")
+    mark = lambda ok: "[green]✓[/green]" if ok else "[red]✗[/red]"
+
+    ok_count = fill_ok = 0
+    answered = [e for e in expected if e.get("answer")]
+    for exp in expected:
+        d = detection[exp["text"]]
+        want = sorted(_norm(p) for p in exp.get("answer", "").split("|") if p.strip())
+        got = fills[exp["text"]]
+        filled = sorted(_norm(p) for p in got) == want if want else True
+        ok_count += d["found"] and d["type_ok"] and d["options_ok"]
+        fill_ok += bool(want) and filled
+        table.add_row(exp["text"][:60], mark(d["found"]), mark(legacy_detection[exp["text"]]["found"]),
+                      mark(d["type_ok"]), mark(d["options_ok"]),
+                      ("[green]" if filled else "[red]") + (" | ".join(got) or "—")[:50] + ("[/green]" if filled else "[/red]"))
+    console.print(table)
+    if extra:
+        console.print(f"[yellow]  Not in the fixture: {extra}[/yellow]")
+    console.print(f"  detection {ok_count}/{len(expected)}  fill {fill_ok}/{len(answered)}  rounds {rounds}")
+    console.print(TIMER.table(title=f"{name} timings"))
+    return ok_count == len(expected) and fill_ok == len(answered) and not extra
+
+
+async def bench(names: List[str], rounds: int) -> bool:
+    fixtures = load_fixtures(names)
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        context = await browser.new_context()
+        await context.route("**/*", _offline)
+        page = await context.new_page()
+        # The solver's per-question ✓ lines would drown the report
+        apply_jobs.console.quiet = True
+        try:
+            results = [await run_fixture(page, name, fx, rounds) for name, fx in fixtures.items()]
+        finally:
+            apply_jobs.console.quiet = False
+            await browser.close()
+    return all(results)
+
+
+async def capture(html_path: str, name: str) -> None:
+    with open(html_path, "r", encoding="utf-8") as f:
+        html = f.read()
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        context = await browser.new_context()
+        await context.route("**/*", _offline)
+        page = await context.new_page()
+        await page.set_content(html, wait_until="domcontentloaded")
+        groups = await get_question_groups(page)
+        await browser.close()
+
+    with open(FIXTURES_FILE, "r", encoding="utf-8") as f:
+        fixtures = json.load(f)
+    fixtures[name] = {
+        "html": html_path,
+        "note": "Captured from the extractor output — check texts, types and options by hand.",
+        "questions": [{"text": g["text"], "type": g["type"], "options": g["options"], "answer": ""} for g in groups],
+    }
+    with open(FIXTURES_FILE, "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, indent=4, ensure_ascii=False)
+    console.print(f"[green]Added '{name}' with {len(groups)} questions to {FIXTURES_FILE}[/green]")
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if args[:1] == ["capture"]:
+        if len(args) != 3:
+            console.print("Usage: python automaton/bench_form_solver.py capture <page.html> <name>")
+            return
+        asyncio.run(capture(args[1], args[2]))
+        return
+
+    rounds = ROUNDS
+    if "--rounds" in args:
+        i = args.index("--rounds")
+        rounds = int(args[i + 1])
+        del args[i:i + 2]
+    if not asyncio.run(bench(args, rounds)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Run Checkpoint
+==============
+Where a run was (discovery source and results page, per search URL) and every job id
+it has already judged, with the verdict, in automaton/checkpoint.json.
+
+A run started with the same queries and exclusions within MAX_AGE_HOURS picks the
+checkpoint up: each search goes straight back to its saved results page, and judged
+jobs are dropped at the card stage instead of being opened and filtered again. Any
+other settings, or an older file, start a fresh checkpoint. Reaching the end of the
+results clears it.
+
+The file is rewritten atomically (temp file + os.replace), at most every
+SAVE_INTERVAL seconds while jobs are being judged and always at page boundaries, so
+an interrupted run loses at most a second of verdicts. path=None keeps the checkpoint
+in memory only (HAR replays).
+"""
+import datetime
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+CHECKPOINT_FILE = "automaton/checkpoint.json"
+MAX_AGE_HOURS = 12
+SAVE_INTERVAL = 1.0
+
+
+def settings_key(keyword: str, location: str, exclude_list: List[str]) -> str:
+    """Stable id for the settings that decide which jobs a run sees and how it judges them."""
+    raw = json.dumps([keyword.strip().lower(), location.strip().lower(), sorted({k.strip().lower() for k in exclude_list})])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class Checkpoint:
+    def __init__(self, key: str, path: Optional[str] = CHECKPOINT_FILE, max_age_hours: float = MAX_AGE_HOURS):
+        self.key = key
+        self.path = path
+        self.positions: Dict[str, Dict] = {}
+        self.verdicts: Dict[str, Dict] = {}
+        self.resumed = False
+        self._dirty = False
+        self._last_save = 0.0
+        self._load(max_age_hours)
+
+    def _load(self, max_age_hours: float) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        updated = datetime.datetime.fromisoformat(data.get("updated_at", "1970-01-01T00:00:00"))
+        if data.get("key") != self.key or datetime.datetime.now() - updated > datetime.timedelta(hours=max_age_hours):
+            return
+        self.positions = data.get("positions", {})
+        if "search_url" in data:
+            # Single-search checkpoint written before per-URL positions
+            self.positions[data["search_url"]] = {"source": data.get("source", ""), "page_no": data.get("page_no", 1)}
+        self.verdicts = data.get("verdicts", {})
+        self.resumed = True
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.verdicts
+
+    def __len__(self) -> int:
+        return len(self.verdicts)
+
+    def start_page(self, source: str, search_url: str) -> int:
+        """Results page to start from: the saved one if it was the same source and URL, else 1."""
+        pos = self.positions.get(search_url)
+        if self.resumed and pos and pos["source"] == source:
+            return pos["page_no"]
+        return 1
+
+    def set_position(self, source: str, search_url: str, page_no: int) -> None:
+        self.positions[search_url] = {"source": source, "page_no": page_no}
+        self._dirty = True
+        self.save()
+
+    def record(self, job_id: str, verdict: str, reason: str = "") -> None:
+        """verdict: "skipped" (reason = filter), "applied" or "failed"."""
+        self.verdicts[job_id] = {"verdict": verdict, "reason": reason}
+        self._dirty = True
+        if time.monotonic() - self._last_save >= SAVE_INTERVAL:
+            self.save()
+
+    def save(self) -> None:
+        if not self._dirty or not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "key": self.key,
+            "updated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "positions": self.positions,
+            "verdicts": self.verdicts,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def clear(self) -> None:
+        """The run got through every result: nothing left to resume."""
+        self.verdicts.clear()
+        self._dirty = False
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
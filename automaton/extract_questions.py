@@ -1,84 +1,22 @@
 import asyncio
-import os
-import re
 from typing import Optional, List, Dict, Set
 from rich.console import Console
 from rich.prompt import Prompt
 from playwright.async_api import async_playwright
 
+from answer_bank import AnswerBank, QUESTIONS_FILE
+from question_watch import QuestionWatch
+
 console = Console()
-QUESTIONS_FILE = "automaton/company_questions.md"
+bank = AnswerBank(QUESTIONS_FILE)
 
 def load_existing_questions() -> Set[str]:
-    """Load all existing questions from the markdown file."""
-    if not os.path.exists(QUESTIONS_FILE):
-        return set()
-    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    questions = set()
-    for match in re.finditer(r"### Question:\s*(.+)", content):
-        questions.add(match.group(1).strip())
-    return questions
+    """All questions already in the shared answer bank."""
+    return bank.questions()
 
 def append_question(q_text: str, q_type: str, answer: str = "", options: Optional[List[str]] = None):
-    """Append a new question and its mapped answer to the markdown file."""
-    with open(QUESTIONS_FILE, "a", encoding="utf-8") as f:
-        f.write(f"### Question: {q_text}\n")
-        f.write(f"### Type: {q_type}\n")
-        if options:
-            f.write(f"### Options: {' | '.join(options)}\n")
-        f.write(f"**Answer:** {answer}\n\n---\n\n")
-
-async def parse_question_block(q_block) -> Optional[Dict]:
-    """Extract question text, type, and options from a UI block."""
-    try:
-        q_text = await q_block.inner_text()
-        q_text = q_text.replace('*', '').strip()
-        
-        # Ignore filter buttons or tiny UI elements
-        if len(q_text) < 5 or "Tampilkan filter" in q_text or "Sembunyikan" in q_text or "Cari" in q_text:
-            return None
-            
-        q_type = "Text"
-        options = []
-        
-        # Navigate up the DOM tree to find the input elements (similar heuristic to apply_jobs.py)
-        wrapper = await q_block.evaluate_handle('''el => {
-            let p = el.parentElement;
-            if (p && p.parentElement) p = p.parentElement;
-            if (p && p.parentElement) p = p.parentElement;
-            return p;
-        }''')
-        
-        # Check if dropdown
-        select = await wrapper.query_selector("select")
-        if select:
-            q_type = "Dropdown"
-            opts = await select.query_selector_all("option")
-            for o in opts:
-                t = await o.inner_text()
-                if t.strip() and "select" not in t.lower() and "pilih" not in t.lower():
-                    options.append(t.strip())
-        else:
-            # Check Radio/Checkbox
-            radios = await wrapper.query_selector_all("input[type='radio'], input[type='checkbox']")
-            if radios:
-                q_type = "Choice"
-                labels = await wrapper.query_selector_all("label")
-                for l in labels:
-                    t = await l.inner_text()
-                    if t.strip():
-                        options.append(t.strip())
-
-        return {
-            "text": q_text,
-            "type": q_type,
-            "options": options
-        }
-    except Exception:
-        # Silently ignore stale element exceptions when rapid DOM changes occur
-        return None
+    """Record a new question and its mapped answer in the shared answer bank."""
+    bank.add(q_text, q_type, answer, options)
 
 async def prompt_user_for_answer(question_data: Dict) -> str:
     """Interactively prompt the user for an answer via the CLI."""
@@ -132,7 +70,11 @@ async def extract_questions():
             
         context = contexts[0]
         page = context.pages[0] if context.pages else await context.new_page()
-        
+
+        # New question blocks are pushed from the page as they render (see question_watch.py)
+        watch = QuestionWatch()
+        await watch.install(page)
+
         # Navigate to JobStreet 
         console.print("[cyan]Switching current tab to JobStreet...[/cyan]")
         await page.goto("https://id.jobstreet.com/")
@@ -144,31 +86,21 @@ async def extract_questions():
         
         try:
             while True:
-                await page.wait_for_timeout(2000)
-                
-                # Look for question blocks based on typical JobStreet form structure
-                form_locator = page.locator("form, div[role='dialog']")
-                if await form_locator.count() > 0:
-                    q_blocks = await form_locator.first.locator("label, [elementtiming='Question Text']").element_handles()
-                else:
-                    q_blocks = await page.locator("label, [elementtiming='Question Text']").element_handles()
-                
-                if len(q_blocks) > 0:
-                    for q_block in q_blocks:
-                        q_data = await parse_question_block(q_block)
-                        
-                        if q_data and q_data["text"] not in existing_questions:
-                            answer = await prompt_user_for_answer(q_data)
-                            
-                            console.print(f"[green]Saving mapped answer for '{q_data['text']}' -> '{answer}'[/green]")
-                            append_question(
-                                q_text=q_data["text"],
-                                q_type=q_data["type"],
-                                answer=answer,
-                                options=q_data["options"] if q_data["options"] else None
-                            )
-                            existing_questions.add(q_data["text"])
-                            
+                q_data = await watch.get()
+                if q_data["text"] in existing_questions:
+                    continue
+
+                answer = await prompt_user_for_answer(q_data)
+
+                console.print(f"[green]Saving mapped answer for '{q_data['text']}' -> '{answer}'[/green]")
+                append_question(
+                    q_text=q_data["text"],
+                    q_type=q_data["type"],
+                    answer=answer,
+                    options=q_data["options"] if q_data["options"] else None
+                )
+                existing_questions.add(q_data["text"])
+
         except asyncio.CancelledError:
             console.print("\n[yellow]Extraction stopped.[/yellow]")
         except KeyboardInterrupt:
@@ -177,6 +109,7 @@ async def extract_questions():
             # Continue polling even on some errors
             pass
 
+        bank.close()
         console.print("[cyan]Disconnecting from browser...[/cyan]")
         await browser.close()
 
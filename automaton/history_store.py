@@ -0,0 +1,128 @@
+"""
+Applied-Job History Store
+=========================
+SQLite (WAL mode) history of every application, keyed by JobStreet job id.
+
+Replaces regex-scanning automaton/applied_job.md on every start: lookups hit the
+primary-key index, so startup cost no longer grows with the history. The old
+markdown file is imported once, and can be regenerated on demand so the history
+stays human-readable:
+
+  python automaton/history_store.py export [path]
+"""
+import datetime
+import os
+import re
+import sqlite3
+import sys
+from typing import Optional
+
+HISTORY_DB = "automaton/applied_jobs.db"
+APPLIED_JOBS_FILE = "automaton/applied_job.md"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applied_jobs (
+    job_id     TEXT PRIMARY KEY,
+    title      TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    location   TEXT,
+    salary     TEXT,
+    applied_at TEXT,
+    dry_run    INTEGER NOT NULL DEFAULT 0,
+    run_id     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_applied_jobs_run ON applied_jobs (run_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# One markdown row; finditer also splits rows that were glued onto one line ("...) || Next |")
+_MD_ROW = re.compile(
+    r"\|\s*([^|\n]*?)\s*\|\s*([^|\n]*?)\s*\|\s*([^|\n]*?)\s*\|\s*\[Link\]\(([^)\s]+)\)\s*\|"
+)
+_DRY_TAG = " (DRY RUN)"
+
+
+def job_id_from_url(url: str) -> str:
+    """Numeric JobStreet id from a job URL (/id/job/12345678), or the bare URL if there is none."""
+    m = re.search(r"/job/(\d+)", url)
+    return m.group(1) if m else url.split("?")[0]
+
+
+class HistoryStore:
+    """`job_id in store` answers "already applied" from the primary-key index."""
+
+    def __init__(self, path: str = HISTORY_DB, markdown_path: Optional[str] = APPLIED_JOBS_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        if markdown_path and not self._get_meta("markdown_migrated"):
+            self.migrate_markdown(markdown_path)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM applied_jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM applied_jobs").fetchone()[0]
+
+    def record(self, title: str, url: str, location: str, salary: str, dry_run: bool,
+               run_id: Optional[str] = None, applied_at: Optional[str] = None) -> None:
+        """Insert or update one application (a real run overwrites an earlier dry run)."""
+        clean_url = url.split("?")[0]
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO applied_jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id_from_url(clean_url), title, clean_url, location, salary,
+                 applied_at or datetime.datetime.now().isoformat(timespec="seconds"), int(dry_run), run_id),
+            )
+
+    def migrate_markdown(self, path: str = APPLIED_JOBS_FILE) -> int:
+        """One-time import of applied_job.md rows. Existing ids are left untouched."""
+        rows = []
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            for title, location, salary, url in _MD_ROW.findall(content):
+                dry_run = title.endswith(_DRY_TAG)
+                if dry_run:
+                    title = title[: -len(_DRY_TAG)]
+                clean_url = url.split("?")[0]
+                rows.append((job_id_from_url(clean_url), title, clean_url, location, salary, None, int(dry_run), None))
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO applied_jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('markdown_migrated', ?)",
+                              (datetime.datetime.now().isoformat(timespec="seconds"),))
+        return len(rows)
+
+    def export_markdown(self, path: str = APPLIED_JOBS_FILE) -> int:
+        """Write the whole history as the applied_job.md table, one row per line."""
+        rows = self.conn.execute(
+            "SELECT title, location, salary, url, dry_run FROM applied_jobs ORDER BY rowid"
+        ).fetchall()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# Applied Jobs History\n\n| Job Title | Location | Salary | Link |\n|---|---|---|---|\n")
+            for title, location, salary, url, dry_run in rows:
+                tag = _DRY_TAG if dry_run else ""
+                f.write(f"| {title}{tag} | {location} | {salary} | [Link]({url}) |\n")
+        return len(rows)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "export":
+        print("Usage: python automaton/history_store.py export [path]")
+    else:
+        out = sys.argv[2] if len(sys.argv) > 2 else APPLIED_JOBS_FILE
+        store = HistoryStore()
+        print(f"Exported {store.export_markdown(out)} applications to {out}")
+        store.close()
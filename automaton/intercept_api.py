@@ -1,31 +1,20 @@
 import asyncio
 import json
-import os
 import sys
 from playwright.async_api import async_playwright
 
-QUESTIONS_FILE = "automaton/company_questions.md"
+from answer_bank import AnswerBank, QUESTIONS_FILE
+
 API_DUMP_FILE = "automaton/jobstreet_questions_api_dump.json"
 
+bank = AnswerBank(QUESTIONS_FILE)
+
 def load_existing_questions() -> set:
-    if not os.path.exists(QUESTIONS_FILE):
-        return set()
-    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    questions = set()
-    import re
-    for match in re.finditer(r"### Question:\s*(.+)", content):
-        questions.add(match.group(1).strip())
-    return questions
+    return bank.questions()
 
 def append_question(q_text, q_type, options=None):
-    with open(QUESTIONS_FILE, "a", encoding="utf-8") as f:
-        f.write(f"### Question: {q_text}\n")
-        f.write(f"### Type: {q_type}\n")
-        if options:
-            f.write(f"### Options: {', '.join(options)}\n")
-        f.write("**Answer:** \n\n---\n\n")
+    # Captured without an answer; fill it in later (or when apply_jobs.py prompts)
+    bank.add(q_text, q_type, "", options)
 
 # This callback intercepts ALL network traffic to find where jobstreet gets its questionnaire schema
 async def handle_response(response):
@@ -112,6 +101,7 @@ async def investigate_source(job_url: str):
         except Exception:
             pass
             
+        bank.close()
         print("Browser closed. Finished tracing APIs.")
         print(f"Check {API_DUMP_FILE} for raw JSON data dumps.")
 
@@ -0,0 +1,119 @@
+"""
+Job Detail Cache
+================
+SQLite cache of what prefetch_job reads off a job detail page — location, salary,
+the jobAdDetails text (zlib-compressed) and the kind of apply button — keyed by job id.
+
+The same ids come back across runs, keywords and recommendation refreshes. With a
+fresh entry the location/description/apply-type filters run without opening the page;
+it is only loaded when the job passes and is about to be applied to. Entries expire
+after TTL_HOURS, and the least recently used ones are evicted beyond MAX_ENTRIES.
+"""
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, Optional
+
+JOB_CACHE_DB = "automaton/job_cache.db"
+TTL_HOURS = 72
+MAX_ENTRIES = 5000
+EVICT_EVERY = 50  # puts between eviction passes
+
+# apply_type values
+APPLY_INTERNAL = "internal"            # JobStreet apply / Lamaran Cepat button
+APPLY_EXTERNAL = "external"            # job-detail-apply-external link
+APPLY_EXTERNAL_SITE = "external_site"  # apply button text points at the company site
+APPLY_NONE = "none"                    # no apply button at all
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_details (
+    job_id      TEXT PRIMARY KEY,
+    location    TEXT,
+    salary      TEXT,
+    description BLOB,
+    apply_type  TEXT NOT NULL,
+    fetched_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_details_last_used ON job_details (last_used);
+"""
+
+
+class JobCache:
+    def __init__(self, path: str = JOB_CACHE_DB, ttl_hours: float = TTL_HOURS, max_entries: int = MAX_ENTRIES):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.ttl_s = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._puts = 0
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Fresh cached detail for a job (and mark it used), or None."""
+        row = self.conn.execute(
+            "SELECT location, salary, description, apply_type, fetched_at FROM job_details WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        now = time.time()
+        if row is None or now - row[4] > self.ttl_s:
+            self.misses += 1
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE job_details SET last_used = ? WHERE job_id = ?", (now, job_id))
+        self.hits += 1
+        return {
+            "location": row[0] or "",
+            "salary": row[1] or "",
+            "description": zlib.decompress(row[2]).decode("utf-8") if row[2] else "",
+            "apply_type": row[3],
+        }
+
+    def put(self, job_id: str, location: str, salary: str, description: str, apply_type: str) -> None:
+        now = time.time()
+        blob = zlib.compress(description.encode("utf-8"), 6) if description else None
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO job_details VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, location, salary, blob, apply_type, now, now),
+            )
+        self._puts += 1
+        if self._puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM job_details WHERE fetched_at < ?", (time.time() - self.ttl_s,))
+            removed = cur.rowcount
+            cur = self.conn.execute(
+                "DELETE FROM job_details WHERE job_id IN "
+                "(SELECT job_id FROM job_details ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            removed += cur.rowcount
+        self.evicted += removed
+        return removed
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM job_details").fetchone()[0]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evicted": self.evicted,
+            "entries": len(self),
+        }
+
+    def close(self) -> None:
+        self.evict()
+        self.conn.close()
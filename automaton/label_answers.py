@@ -0,0 +1,203 @@
+"""
+Bulk Answer Labeling
+====================
+Answers every known-but-unanswered question in one sitting, so later runs get through
+navigate_form without a single prompt.
+
+Questions are collected from:
+  - company_questions.json entries with an empty answer (intercept_api.py captures
+    questions without one, extract_questions.py when the answer was left blank)
+  - the run logs: questions of parked jobs, and questions answered by hand during an
+    application that the bank doesn't have (their logged answer becomes the
+    suggestion; answers from the bank or a profile rule are not queued)
+  - the pending queue's open questions (pending_queue.py)
+
+Near-duplicates are clustered: same type, the same options once normalized and
+mapped through the answer lookup's Bahasa→English synonyms ("Ya/Tidak" = "Yes/No"),
+and wording within CLUSTER_THRESHOLD of each other by the same TF-IDF similarity the
+answer lookup uses (so the Bahasa and English phrasings of a question land together).
+One answer — text, or option number(s) from the first question's list — is written to
+the bank for every question of the cluster, as each question's own option wording,
+and passed on to the pending queue for parked ones.
+
+  python automaton/label_answers.py          # label cluster by cluster
+  python automaton/label_answers.py list     # only show the clusters
+
+Run it while the bot is stopped: the bot keeps its own copy of the bank and folds it
+back into company_questions.json, which would drop answers written in between (the
+pending queue's own CLI is the way to answer during a run).
+"""
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.prompt import Prompt
+
+from answer_bank import AnswerBank, QUESTIONS_FILE
+from pending_queue import PendingQueue
+from question_index import QuestionIndex, normalize_question, question_terms
+from run_logger import read_run_log, run_log_paths
+
+console = Console()
+
+CLUSTER_THRESHOLD = 0.8
+
+
+def collect_questions(bank: AnswerBank, pending: PendingQueue) -> Dict[str, Dict]:
+    """Unanswered question text → {type, options, sources (Counter), suggestion}."""
+    found: Dict[str, Dict] = {}
+
+    def add(text: str, q_type: str, options: Optional[List[str]], source: str, suggestion: str = "") -> None:
+        entry = found.setdefault(text, {"type": q_type, "options": options or [], "sources": Counter(), "suggestion": ""})
+        entry["sources"][source] += 1
+        if suggestion and not entry["suggestion"]:
+            entry["suggestion"] = suggestion
+
+    for text, data in bank.entries.items():
+        if not data.get("answer"):
+            add(text, data.get("type", "Text"), data.get("options"), "bank")
+
+    for path in run_log_paths():
+        log = read_run_log(path)
+        for job in log.get("parked_jobs", []):
+            for q in job.get("questions") or []:
+                if isinstance(q, dict) and not (bank.get(q["text"]) or {}).get("answer"):
+                    add(q["text"], q.get("type", "Text"), q.get("options"), "parked")
+        for job in log.get("applied_jobs", []):
+            for q in job.get("questions", []):
+                # Only answers typed by hand: "match" ones came from the bank or a profile rule,
+                # and entries from older logs without a type can't be written back faithfully
+                if q.get("match") or not q.get("type") or not q.get("question") or q["question"] in bank:
+                    continue
+                add(q["question"], q["type"], q.get("options"), "log", q.get("answer", ""))
+
+    for q in pending.open_questions():
+        add(q["text"], q["type"], q["options"], "pending")
+    return found
+
+
+def _option_key(option: str) -> str:
+    """An option as the answer lookup sees it: normalized, Bahasa mapped to English."""
+    return " ".join(question_terms(normalize_question(option))) or normalize_question(option)
+
+
+def _options_key(options: List[str]) -> Tuple[str, ...]:
+    return tuple(sorted(_option_key(o) for o in options))
+
+
+def _answer_for(answer: str, rep_options: List[str], options: List[str]) -> str:
+    """The answer in a question's own option wording ("Yes" → "Ya"), for options the clusters share."""
+    if not options:
+        return answer
+    own = {_option_key(o): o for o in options}
+    parts = []
+    for part in answer.split(" | "):
+        parts.append(own.get(_option_key(part), part) if part in rep_options else part)
+    return " | ".join(parts)
+
+
+def cluster_questions(questions: Dict[str, Dict], threshold: float = CLUSTER_THRESHOLD) -> List[List[str]]:
+    """Greedy clusters of near-duplicate question texts, biggest first."""
+    by_shape: Dict[Tuple, List[str]] = {}
+    for text, q in questions.items():
+        by_shape.setdefault((q["type"], _options_key(q["options"])), []).append(text)
+
+    clusters: List[List[str]] = []
+    for texts in by_shape.values():
+        # Most-seen question first, so it becomes the cluster's representative
+        texts.sort(key=lambda t: -sum(questions[t]["sources"].values()))
+        reps = QuestionIndex({}, threshold=threshold)
+        local: List[List[str]] = []
+        for text in texts:
+            match = reps.nearest(text)
+            if match:
+                local[int(match.answer)].append(text)
+            else:
+                reps.add(text, str(len(local)))
+                local.append([text])
+        clusters += local
+    clusters.sort(key=lambda c: -sum(sum(questions[t]["sources"].values()) for t in c))
+    return clusters
+
+
+def _parse_answer(raw: str, q_type: str, options: List[str]) -> str:
+    """Option number(s) → option text; anything else is the answer as typed."""
+    parts = [p.strip() for p in raw.split(",")] if q_type == "MultiChoice" else [raw.strip()]
+    picked = []
+    for p in parts:
+        if not p:
+            continue
+        idx = int(p) - 1 if p.isdigit() else -1
+        picked.append(options[idx] if 0 <= idx < len(options) else p)
+    return " | ".join(picked)
+
+
+def show_cluster(n: int, total: int, cluster: List[str], questions: Dict[str, Dict], suggestion: str) -> None:
+    rep = questions[cluster[0]]
+    seen = sum(sum(questions[t]["sources"].values()) for t in cluster)
+    sources = sum((questions[t]["sources"] for t in cluster), Counter())
+    console.print(f"\n[bold cyan]Cluster {n}/{total}[/bold cyan]  [dim]{rep['type']}, seen {seen}x "
+                  f"({', '.join(f'{k} {v}' for k, v in sources.items())})[/dim]")
+    for text in cluster:
+        console.print(f"  • {text}")
+    for i, opt in enumerate(rep["options"], 1):
+        console.print(f"    {i}. {opt}")
+    if suggestion:
+        console.print(f"  [dim]Suggested: {suggestion}[/dim]")
+
+
+def label(list_only: bool = False) -> None:
+    bank = AnswerBank(QUESTIONS_FILE)
+    pending = PendingQueue()
+    try:
+        questions = collect_questions(bank, pending)
+        if not questions:
+            console.print("[green]Nothing to label: every known question has an answer.[/green]")
+            return
+        clusters = cluster_questions(questions)
+        console.print(f"[cyan]{len(questions)} unanswered questions in {len(clusters)} clusters.[/cyan]")
+        answered_index = QuestionIndex(bank.answers(), types=bank.types())
+        open_pending = {q["text"] for q in pending.open_questions()}
+
+        labeled = 0
+        for n, cluster in enumerate(clusters, 1):
+            rep = questions[cluster[0]]
+            suggestion = next((questions[t]["suggestion"] for t in cluster if questions[t]["suggestion"]), "")
+            if not suggestion:
+                match = answered_index.lookup(cluster[0], rep["options"], rep["type"])
+                suggestion = match.answer if match else ""
+            show_cluster(n, len(clusters), cluster, questions, suggestion)
+            if list_only:
+                continue
+
+            hint = "number(s) comma-separated" if rep["type"] == "MultiChoice" else "number"
+            prompt = f"Answer ({hint} or text; Enter = {'suggestion' if suggestion else 'skip'}, q = quit)" \
+                if rep["options"] else f"Answer (Enter = {'suggestion' if suggestion else 'skip'}, q = quit)"
+            raw = Prompt.ask(prompt, default="").strip()
+            if raw.lower() == "q":
+                break
+            ans = _parse_answer(raw, rep["type"], rep["options"]) if raw else suggestion
+            if not ans:
+                continue
+            for text in cluster:
+                q = questions[text]
+                own = _answer_for(ans, rep["options"], q["options"])
+                bank.add(text, q["type"], own, q["options"] or None)
+                if text in open_pending:
+                    pending.answer(text, q["type"], q["options"], own)
+            labeled += 1
+            console.print(f"  [green]✓ {len(cluster)} question(s) → {ans}[/green]")
+
+        if not list_only:
+            console.print(f"\n[bold green]Labeled {labeled} cluster(s); saved to {QUESTIONS_FILE}.[/bold green]")
+    finally:
+        bank.close()
+        pending.close()
+
+
+if __name__ == "__main__":
+    try:
+        label(list_only=sys.argv[1:2] == ["list"])
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped; answers given so far are saved.[/yellow]")
@@ -0,0 +1,130 @@
+"""
+Network Policy
+==============
+Blocks requests the automation never needs — images, media, fonts, analytics beacons
+and ad scripts — on every page of the run.
+
+Blocking goes through Chromium's own Network.setBlockedURLs (one CDP session per
+page), not context.route(): registering any Playwright route turns the HTTP cache
+off, and every SERP, detail page and apply step would then re-download the JobStreet
+JS/CSS bundles the persistent profile serves from cache. The price is that CDP
+matches URL patterns only, so resource types are blocked by file extension
+(BLOCK_EXTENSIONS) and hosts by wildcard (DENY_HOSTS); extensionless image URLs load.
+A block type without extensions in BLOCK_EXTENSIONS is rejected (ValueError). CDP has
+no exceptions either, so ALLOW_HOSTS only keeps hosts off the deny list: a .png or
+.woff on a login host is still blocked like any other.
+
+Pages opened later are picked up from the context's "page" event; the session is
+attached while the first document is still loading, so a page's very first
+subresources may slip through. Blocked requests (net::ERR_BLOCKED_BY_CLIENT) are
+counted per resource type and host; bytes saved are an estimate (a blocked request
+has no size), using EST_BYTES per type.
+"""
+import asyncio
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Page, Request
+
+BLOCK_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCK_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "media": ("mp4", "webm", "mp3", "m4a", "ogg"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+}
+
+# Matched as domain suffixes ("doubleclick.net" also blocks "stats.g.doubleclick.net")
+DENY_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adservice.google.com", "connect.facebook.net",
+    "hotjar.com", "clarity.ms", "bat.bing.com", "analytics.tiktok.com", "segment.io", "segment.com",
+    "nr-data.net", "newrelic.com", "sentry.io", "branch.io", "appsflyer.com", "criteo.com",
+    "taboola.com", "outbrain.com", "adnxs.com", "braze.com", "optimizely.com",
+)
+
+# Never put on the deny list, whatever DENY_HOSTS says: login must keep working.
+# Host rules only — the extension patterns apply to these hosts too
+ALLOW_HOSTS = ("accounts.google.com", "appleid.apple.com", "login.seek.com", "login.jobstreet.com")
+
+# Rough average transfer size per blocked request, for the "bytes saved" estimate
+EST_BYTES = {"image": 40_000, "media": 400_000, "font": 35_000, "script": 60_000, "stylesheet": 20_000}
+EST_BYTES_DEFAULT = 5_000
+
+BLOCKED_ERROR = "net::ERR_BLOCKED_BY_CLIENT"
+
+
+def _host_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class NetworkPolicy:
+    def __init__(self, block_types: Optional[Iterable[str]] = None, deny_hosts: Iterable[str] = DENY_HOSTS,
+                 allow_hosts: Iterable[str] = ALLOW_HOSTS):
+        self.block_types = set(BLOCK_RESOURCE_TYPES if block_types is None else block_types)
+        unknown = self.block_types - set(BLOCK_EXTENSIONS)
+        if unknown:
+            raise ValueError(f"No URL patterns for resource types {sorted(unknown)}; known: {sorted(BLOCK_EXTENSIONS)}")
+        self.allow_hosts = tuple(allow_hosts)
+        self.deny_hosts = tuple(h for h in deny_hosts if not _host_matches(h, self.allow_hosts))
+        self.allowed = 0
+        self.blocked_by_type: Counter = Counter()
+        self.blocked_by_host: Counter = Counter()
+        self.est_bytes_saved = 0
+        self._attached: Set[Page] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def patterns(self) -> List[str]:
+        """Network.setBlockedURLs patterns ('*' wildcards) for the blocked types and hosts."""
+        patterns = []
+        for rtype in sorted(self.block_types):
+            for ext in BLOCK_EXTENSIONS[rtype]:
+                patterns += [f"*.{ext}", f"*.{ext}?*"]
+        for host in self.deny_hosts:
+            patterns += [f"*://{host}/*", f"*://*.{host}/*"]
+        return patterns
+
+    async def attach(self, page: Page) -> None:
+        """Turn blocking on for one page (idempotent)."""
+        if page in self._attached:
+            return
+        self._attached.add(page)
+        # Job detail and apply tabs come and go all run long: don't keep closed ones alive
+        page.on("close", self._attached.discard)
+        try:
+            cdp = await page.context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Network.setBlockedURLs", {"urls": self.patterns()})
+        except Exception:
+            self._attached.discard(page)  # closed already, or not Chromium
+
+    def _on_page(self, page: Page) -> None:
+        task = asyncio.ensure_future(self.attach(page))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_failed(self, req: Request) -> None:
+        if req.failure != BLOCKED_ERROR:
+            return
+        self.blocked_by_type[req.resource_type] += 1
+        self.blocked_by_host[urlparse(req.url).hostname or ""] += 1
+        self.est_bytes_saved += EST_BYTES.get(req.resource_type, EST_BYTES_DEFAULT)
+
+    def _on_finished(self, req: Request) -> None:
+        self.allowed += 1
+
+    async def install(self, context: BrowserContext) -> None:
+        context.on("page", self._on_page)
+        context.on("requestfailed", self._on_failed)
+        context.on("requestfinished", self._on_finished)
+        for page in context.pages:
+            await self.attach(page)
+
+    def stats(self) -> Dict:
+        return {
+            "allowed": self.allowed,
+            "blocked": sum(self.blocked_by_type.values()),
+            "blocked_by_type": dict(self.blocked_by_type),
+            "top_blocked_hosts": dict(self.blocked_by_host.most_common(10)),
+            "est_bytes_saved": self.est_bytes_saved,
+        }
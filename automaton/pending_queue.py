@@ -0,0 +1,251 @@
+"""
+Pending Question Queue
+======================
+Jobs parked on questions nobody has answered yet, so an unattended run moves on to
+the next candidate instead of waiting on a prompt.
+
+With park mode on, navigate_form stops at the first step that has unknown questions
+and the run puts the job and those questions here (SQLite, WAL mode, so a run and the
+answering CLI can use it at the same time). Answers are given from a separate
+terminal, whenever someone is around:
+
+  python automaton/pending_queue.py            # answer the open questions
+  python automaton/pending_queue.py list       # parked jobs and what they wait on
+
+The CLI doesn't touch company_questions.json directly (the running process owns it and
+would compact over it); answers wait in this database until a run imports them into
+the answer bank. Before every results page the run imports new answers, then
+re-opens the parked jobs whose questions all have one. Jobs parked again on a later
+step keep their place with the new questions; after PARK_MAX_ATTEMPTS parks a job is
+dropped as failed.
+
+A question parked because its saved answer didn't fit the form (failed_answer) stays
+open until the CLI gives it a new answer: the bank still has the old one, so "the
+bank knows it" is not enough to re-open the job.
+"""
+import datetime
+import json
+import os
+import sqlite3
+import sys
+from typing import Callable, Dict, List
+
+from rich.console import Console
+from rich.prompt import Prompt
+from rich.table import Table
+
+console = Console()
+
+PENDING_DB = "automaton/pending_jobs.db"
+PARK_MAX_ATTEMPTS = 3  # parks per job (first one included) before the run gives up on it
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_jobs (
+    job_id    TEXT PRIMARY KEY,
+    title     TEXT NOT NULL,
+    job_url   TEXT NOT NULL,
+    location  TEXT,
+    salary    TEXT,
+    parked_at TEXT NOT NULL,
+    attempts  INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS pending_questions (
+    job_id        TEXT NOT NULL,
+    question      TEXT NOT NULL,
+    type          TEXT NOT NULL,
+    options       TEXT NOT NULL,
+    failed_answer TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (job_id, question)
+);
+CREATE TABLE IF NOT EXISTS pending_answers (
+    question    TEXT PRIMARY KEY,
+    type        TEXT NOT NULL,
+    options     TEXT NOT NULL,
+    answer      TEXT NOT NULL,
+    answered_at TEXT NOT NULL,
+    imported    INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class PendingQueue:
+    def __init__(self, path: str = PENDING_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # The CLI may be writing an answer at the same moment
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        columns = [r[1] for r in self.conn.execute("PRAGMA table_info(pending_questions)")]
+        if "failed_answer" not in columns:  # databases from before failed answers were tracked
+            self.conn.execute("ALTER TABLE pending_questions ADD COLUMN failed_answer TEXT NOT NULL DEFAULT ''")
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pending_jobs").fetchone()[0]
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM pending_jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def park(self, job: Dict, questions: List[Dict]) -> None:
+        """
+        Queue a job (job_id, title, job_url, loc_text, sal_text) with the questions it
+        stopped on. A question carrying a failed_answer needs a new answer: an earlier
+        one from the CLI for it is dropped.
+        """
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO pending_jobs (job_id, title, job_url, location, salary, parked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET parked_at = excluded.parked_at, attempts = attempts + 1
+                """,
+                (job["job_id"], job["title"], job["job_url"], job.get("loc_text", ""), job.get("sal_text", ""), now),
+            )
+            self.conn.execute("DELETE FROM pending_questions WHERE job_id = ?", (job["job_id"],))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pending_questions (job_id, question, type, options, failed_answer) VALUES (?, ?, ?, ?, ?)",
+                [(job["job_id"], q["text"], q["type"], json.dumps(q.get("options", []), ensure_ascii=False),
+                  q.get("failed_answer", "")) for q in questions],
+            )
+            self.conn.executemany(
+                "DELETE FROM pending_answers WHERE question = ?",
+                [(q["text"],) for q in questions if q.get("failed_answer")],
+            )
+
+    def resolve(self, job_id: str) -> None:
+        """The job was re-opened and applied to (or failed for good): drop it."""
+        with self.conn:
+            self.conn.execute("DELETE FROM pending_jobs WHERE job_id = ?", (job_id,))
+            self.conn.execute("DELETE FROM pending_questions WHERE job_id = ?", (job_id,))
+
+    def open_questions(self) -> List[Dict]:
+        """Distinct unanswered questions over all parked jobs, most-waited-on first."""
+        rows = self.conn.execute(
+            """
+            SELECT q.question, q.type, q.options, COUNT(*) AS jobs, MAX(q.failed_answer)
+            FROM pending_questions q
+            LEFT JOIN pending_answers a ON a.question = q.question
+            WHERE a.question IS NULL
+            GROUP BY q.question
+            ORDER BY jobs DESC, MIN(q.rowid)
+            """
+        ).fetchall()
+        return [{"text": r[0], "type": r[1], "options": json.loads(r[2]), "jobs": r[3], "failed_answer": r[4]}
+                for r in rows]
+
+    def answer(self, question: str, q_type: str, options: List[str], answer: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pending_answers (question, type, options, answer, answered_at) VALUES (?, ?, ?, ?, ?)",
+                (question, q_type, json.dumps(options, ensure_ascii=False), answer,
+                 datetime.datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def take_answers(self) -> List[Dict]:
+        """Answers given from the CLI since the last call; the caller moves them into the answer bank."""
+        with self.conn:
+            rows = self.conn.execute("SELECT question, type, options, answer FROM pending_answers WHERE imported = 0").fetchall()
+            self.conn.execute("UPDATE pending_answers SET imported = 1 WHERE imported = 0")
+        return [{"text": r[0], "type": r[1], "options": json.loads(r[2]), "answer": r[3]} for r in rows]
+
+    def ready(self, is_answered: Callable[[str, str, List[str]], bool]) -> List[Dict]:
+        """
+        Parked jobs whose every question is_answered(text, type, options) now, oldest first;
+        questions with a failed_answer count only once the CLI has answered them anew.
+        """
+        jobs = self.conn.execute(
+            "SELECT job_id, title, job_url, location, salary, attempts FROM pending_jobs ORDER BY parked_at"
+        ).fetchall()
+        ready = []
+        for job_id, title, job_url, location, salary, attempts in jobs:
+            questions = self.conn.execute(
+                """
+                SELECT q.question, q.type, q.options, q.failed_answer, a.question IS NOT NULL
+                FROM pending_questions q LEFT JOIN pending_answers a ON a.question = q.question
+                WHERE q.job_id = ?
+                """, (job_id,)
+            ).fetchall()
+            if all(has_new if failed else is_answered(q, q_type, json.loads(opts))
+                   for q, q_type, opts, failed, has_new in questions):
+                ready.append({"job_id": job_id, "title": title, "job_url": job_url,
+                              "clean_url": job_url.split("?")[0], "location": location,
+                              "salary": salary, "attempts": attempts})
+        return ready
+
+    def jobs(self) -> List[Dict]:
+        rows = self.conn.execute(
+            """
+            SELECT j.job_id, j.title, j.parked_at, j.attempts, GROUP_CONCAT(q.question, ' / ')
+            FROM pending_jobs j LEFT JOIN pending_questions q ON q.job_id = j.job_id
+            GROUP BY j.job_id ORDER BY j.parked_at
+            """
+        ).fetchall()
+        return [{"job_id": r[0], "title": r[1], "parked_at": r[2], "attempts": r[3], "questions": r[4] or ""}
+                for r in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _ask(q: Dict) -> str:
+    console.print(f"\n[bold magenta]{q['text']}[/bold magenta]  [dim]({q['type']}, {q['jobs']} job(s) waiting)[/dim]")
+    if q.get("failed_answer"):
+        console.print(f"  [yellow]The saved answer '{q['failed_answer']}' didn't fit this form.[/yellow]")
+    options = q["options"]
+    if not options:
+        return Prompt.ask("Your answer (empty to skip)", default="").strip()
+    for i, opt in enumerate(options, 1):
+        console.print(f"  {i}. {opt}")
+    multi = q["type"] == "MultiChoice"
+    raw = Prompt.ask("Number(s) comma-separated or exact text (empty to skip)" if multi
+                     else "Number or exact text (empty to skip)", default="")
+    parts = [p.strip() for p in raw.split(",")] if multi else [raw.strip()]
+    picked = []
+    for p in parts:
+        if not p:
+            continue
+        idx = int(p) - 1 if p.isdigit() else -1
+        picked.append(options[idx] if 0 <= idx < len(options) else p)
+    return " | ".join(picked)
+
+
+def answer_open_questions(queue: PendingQueue) -> None:
+    questions = queue.open_questions()
+    if not questions:
+        console.print("[green]No open questions.[/green]")
+        return
+    console.print(f"[cyan]{len(questions)} open question(s) over {len(queue)} parked job(s).[/cyan]")
+    answered = 0
+    for q in questions:
+        ans = _ask(q)
+        if ans:
+            queue.answer(q["text"], q["type"], q["options"], ans)
+            answered += 1
+    console.print(f"\n[green]Saved {answered} answer(s). The next results page of a run (or the next run) picks them up.[/green]")
+
+
+def list_jobs(queue: PendingQueue) -> None:
+    table = Table(title=f"Parked jobs ({len(queue)})")
+    table.add_column("job id")
+    table.add_column("title")
+    table.add_column("parked")
+    table.add_column("tries", justify="right")
+    table.add_column("waiting on")
+    for j in queue.jobs():
+        table.add_row(j["job_id"], j["title"][:40], j["parked_at"], str(j["attempts"]), j["questions"][:80])
+    console.print(table)
+
+
+if __name__ == "__main__":
+    pending = PendingQueue()
+    try:
+        if sys.argv[1:2] == ["list"]:
+            list_jobs(pending)
+        else:
+            answer_open_questions(pending)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped; answers given so far are saved.[/yellow]")
+    finally:
+        pending.close()
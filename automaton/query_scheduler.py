@@ -0,0 +1,90 @@
+"""
+Search Query Scheduler
+======================
+Several (keyword, location) searches in one run, one browser session and one login
+check. Each query gets its own batch source (a SERP tab or the search API, see
+apply_jobs.open_query), and round_robin() takes one results page from each query in
+turn until all of them run out.
+
+Job ids are deduplicated across queries before they are yielded: a job listed under
+both "guru" and "ict" is filtered and opened once, credited to the query that listed
+it first. Every query counts what it contributed (cards listed, new after the
+cross-query dedupe, passed the card filter, passed the detail filter, applied), so a
+run ends with each query's yield.
+"""
+import itertools
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from rich.table import Table
+
+STAGES = ("listed", "new", "passed_card", "passed_detail", "applied")
+
+
+def parse_queries(keywords: str, locations: str) -> List[Tuple[str, str]]:
+    """
+    Comma-separated keywords x comma-separated locations, in prompt order. An empty
+    keyword field is a single recommendation-mode query per location.
+    """
+    kws = list(dict.fromkeys(k.strip() for k in keywords.split(",") if k.strip())) or [""]
+    locs = list(dict.fromkeys(l.strip() for l in locations.split(",") if l.strip())) or [""]
+    return list(itertools.product(kws, locs))
+
+
+class SearchQuery:
+    def __init__(self, keyword: str, location: str, matcher: Any):
+        self.keyword = keyword
+        self.location = location
+        self.matcher = matcher  # apply_jobs.ExclusionMatcher built for this keyword
+        self.search_url = ""
+        self.source = ""
+        self.batches: Optional[AsyncIterator[Tuple[int, Dict[str, Dict]]]] = None
+        self.stats: Counter = Counter({stage: 0 for stage in STAGES})
+        self.pages = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.keyword or 'recommendations'} @ {self.location or 'anywhere'}"
+
+    def summary(self) -> Dict:
+        return {"keyword": self.keyword, "location": self.location, "source": self.source,
+                "pages": self.pages, **self.stats}
+
+
+async def round_robin(queries: List[SearchQuery]) -> AsyncIterator[Tuple[SearchQuery, int, Dict[str, Dict]]]:
+    """
+    (query, results page number, cards new to this run), one page per query in turn.
+    A query drops out when its source is exhausted; every source is closed at the end.
+    """
+    seen: Set[str] = set()
+    active = [q for q in queries if q.batches is not None]
+    try:
+        while active:
+            for q in list(active):
+                try:
+                    page_no, cards = await q.batches.__anext__()
+                except StopAsyncIteration:
+                    active.remove(q)
+                    continue
+                q.pages += 1
+                unique = {job_id: card for job_id, card in cards.items() if job_id not in seen}
+                seen.update(unique)
+                q.stats["listed"] += len(cards)
+                q.stats["new"] += len(unique)
+                yield q, page_no, unique
+    finally:
+        for q in queries:
+            if q.batches is not None:
+                await q.batches.aclose()
+
+
+def yield_table(queries: List[SearchQuery], title: str = "Per-query yield") -> Table:
+    table = Table(title=title)
+    table.add_column("query")
+    table.add_column("source")
+    table.add_column("pages", justify="right")
+    for stage in STAGES:
+        table.add_column(stage.replace("_", " "), justify="right")
+    for q in queries:
+        table.add_row(q.label, q.source or "—", str(q.pages), *(str(q.stats[stage]) for stage in STAGES))
+    return table
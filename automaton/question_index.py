@@ -0,0 +1,202 @@
+"""
+Question Index
+==============
+Looks up a saved answer for a form question whose wording doesn't match the bank exactly.
+
+Three tiers, tried in order:
+  exact      - the question text as stored in company_questions.json
+  normalized - case, punctuation, quote style and whitespace folded away
+  similar    - TF-IDF cosine over the whole bank (NumPy), with common Bahasa words
+               mapped onto their English equivalents so "Berapa gaji bulanan yang kamu
+               inginkan?" lands next to "What's your expected monthly basic salary?"
+
+A similar-tier hit must clear MATCH_THRESHOLD, be for a bank question of the same type,
+and name one of the options on screen; Text questions (nothing to check an answer
+against) never take a similar-tier answer. Otherwise the caller prompts or parks as
+before.
+"""
+import re
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # the similar tier is skipped without NumPy
+    np = None
+
+MATCH_THRESHOLD = 0.85
+
+# Bahasa Indonesia → English, applied per token before weighting
+SYNONYMS = {
+    "gaji": "salary", "upah": "salary", "bulanan": "monthly", "bulan": "month", "tahun": "year",
+    "pengalaman": "experience", "berpengalaman": "experience", "lama": "long",
+    "inginkan": "expected", "diinginkan": "expected", "harapkan": "expected", "diharapkan": "expected",
+    "ekspektasi": "expected", "kualifikasi": "qualification", "pendidikan": "education",
+    "bahasa": "language", "inggris": "english", "mahir": "proficient", "kemampuan": "skill",
+    "keterampilan": "skill", "skills": "skill", "bekerja": "work", "kerja": "work", "pekerjaan": "job",
+    "mengajar": "teaching", "guru": "teacher", "bersedia": "willing", "relokasi": "relocate",
+    "lokasi": "location", "perusahaan": "company", "pemberitahuan": "notice", "mulai": "start",
+    "segera": "immediately", "hak": "right", "kewarganegaraan": "citizenship", "warga": "citizen",
+    "menilai": "rate", "sertifikat": "certificate", "sertifikasi": "certification", "gelar": "degree",
+    "ya": "yes", "tidak": "no", "bukan": "no",
+}
+
+STOPWORDS = {
+    # English
+    "a", "an", "the", "do", "does", "did", "you", "your", "yours", "have", "has", "are", "is", "what",
+    "which", "how", "many", "much", "s", "of", "in", "to", "for", "as", "with", "on", "at", "be",
+    "would", "will", "any", "please", "can", "currently",
+    # Bahasa Indonesia
+    "kamu", "anda", "yang", "apa", "apakah", "berapa", "di", "dan", "untuk", "ini", "itu", "dengan",
+    "sebagai", "ada", "dari", "ke", "saat", "dalam", "memiliki", "punya", "sudah", "telah",
+}
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+class QuestionMatch(NamedTuple):
+    question: str   # the bank question that matched
+    answer: str
+    tier: str       # "exact" | "normalized" | "similar"
+    score: float
+
+
+def normalize_question(text: str) -> str:
+    """Fold case, accents-compatible forms, quotes/punctuation and whitespace."""
+    text = unicodedata.normalize("NFKC", text).lower().replace("’", "'")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def question_terms(normalized: str) -> List[str]:
+    """Content words of a normalized question, Bahasa mapped to English, plural 's' dropped."""
+    terms = []
+    for tok in normalized.split():
+        if tok not in SYNONYMS:
+            # Possessive suffixes: "inggrismu", "pengalamannya"
+            for suffix in ("mu", "nya"):
+                if tok.endswith(suffix) and tok[: -len(suffix)] in SYNONYMS:
+                    tok = tok[: -len(suffix)]
+                    break
+        tok = SYNONYMS.get(tok, tok)
+        if tok in STOPWORDS:
+            continue
+        if len(tok) > 4 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        terms.append(tok)
+    return terms
+
+
+def answer_fits_options(answer: str, options: List[str]) -> bool:
+    """Same loose text test fill_question_group uses to pick an option."""
+    opts = [o.lower() for o in options]
+    for part in answer.lower().split("|"):
+        part = part.strip()
+        if part and any(part in o or o in part for o in opts):
+            return True
+    return False
+
+
+class QuestionIndex:
+    def __init__(self, answers: Dict[str, str], threshold: float = MATCH_THRESHOLD,
+                 types: Optional[Dict[str, str]] = None):
+        self.threshold = threshold
+        self.answers: Dict[str, str] = {}
+        self.types: Dict[str, str] = dict(types or {})
+        self._normalized: Dict[str, str] = {}
+        self._questions: List[str] = []
+        self._matrix = None
+        self._dirty = True
+        for q, a in answers.items():
+            self.add(q, a)
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def add(self, q_text: str, answer: str, q_type: str = "") -> None:
+        if not answer:
+            return
+        if q_type:
+            self.types[q_text] = q_type
+        if q_text not in self.answers:
+            self._questions.append(q_text)
+            self._dirty = True
+        self.answers[q_text] = answer
+        self._normalized[normalize_question(q_text)] = q_text
+
+    def lookup(self, q_text: str, options: Optional[List[str]] = None,
+               q_type: Optional[str] = None) -> Optional[QuestionMatch]:
+        """Exact, normalized, then similar (same q_type, answer among the options) saved answer."""
+        if q_text in self.answers:
+            return QuestionMatch(q_text, self.answers[q_text], "exact", 1.0)
+
+        norm = normalize_question(q_text)
+        if norm in self._normalized:
+            q = self._normalized[norm]
+            return QuestionMatch(q, self.answers[q], "normalized", 1.0)
+
+        if not options:
+            return None
+        for q, score in self._similar(norm):
+            if q_type and self.types.get(q) != q_type:
+                continue
+            if not answer_fits_options(self.answers[q], options):
+                continue
+            return QuestionMatch(q, self.answers[q], "similar", score)
+        return None
+
+    def nearest(self, q_text: str) -> Optional[QuestionMatch]:
+        """Most similar question above the threshold, with no type or option checks (clustering)."""
+        if q_text in self.answers:
+            return QuestionMatch(q_text, self.answers[q_text], "exact", 1.0)
+        for q, score in self._similar(normalize_question(q_text)):
+            return QuestionMatch(q, self.answers[q], "similar", score)
+        return None
+
+    def _similar(self, norm: str):
+        """(bank question, score) above the threshold, best first."""
+        if np is None or not self._questions:
+            return
+        if self._dirty:
+            self._rebuild()
+        scores = self._matrix @ self._vectorize(question_terms(norm))
+        for i in np.argsort(-scores):
+            score = float(scores[i])
+            if score < self.threshold:
+                break
+            yield self._questions[i], round(score, 3)
+
+    def _rebuild(self) -> None:
+        docs = [question_terms(normalize_question(q)) for q in self._questions]
+        self._vocab: Dict[str, int] = {}
+        for terms in docs:
+            for t in terms:
+                self._vocab.setdefault(t, len(self._vocab))
+
+        tf = np.zeros((len(docs), max(len(self._vocab), 1)), dtype=np.float32)
+        for i, terms in enumerate(docs):
+            for t in terms:
+                tf[i, self._vocab[t]] += 1.0
+        n = len(docs)
+        df = np.count_nonzero(tf, axis=0)
+        self._idf = np.log((1.0 + n) / (1.0 + df)).astype(np.float32) + 1.0
+        # Weight for words the bank has never seen: they still count against the query's norm
+        self._unseen_idf = float(np.log(1.0 + n) + 1.0)
+
+        m = tf * self._idf
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._matrix = m / norms
+        self._dirty = False
+
+    def _vectorize(self, terms: List[str]):
+        vec = np.zeros(self._matrix.shape[1], dtype=np.float32)
+        unseen: Dict[str, int] = {}
+        for t in terms:
+            j = self._vocab.get(t)
+            if j is None:
+                unseen[t] = unseen.get(t, 0) + 1
+            else:
+                vec[j] += self._idf[j]
+        unseen_sq = sum((c * self._unseen_idf) ** 2 for c in unseen.values())
+        norm = float(np.sqrt(float(vec @ vec) + unseen_sq))
+        return vec / norm if norm else vec
@@ -0,0 +1,133 @@
+"""
+Question Watch
+==============
+Pushes question blocks from the page to Python as soon as they render, instead of
+Python polling the DOM for them.
+
+An init script installs a MutationObserver on every document of the page (or of the
+whole context). When nodes are added or text changes it waits for the burst of
+mutations to settle (SETTLE_MS), then looks at the label / [elementtiming='Question
+Text'] elements inside the first form or dialog, skips the elements it has already
+reported, and reads the others — text, type, options — in the page, with the same DOM
+heuristic extract_questions.py used to run through element handles. An element is
+only marked reported once it parses as a question (a Dropdown once it has options),
+so labels and selects that fill in after mounting are picked up when they do. The results go to Python
+through one page.expose_binding call per batch and queue up in QuestionWatch.
+
+Nothing runs while the DOM is quiet, and no reported element is parsed again. Question texts
+already delivered are not delivered again, even if the page re-renders the block.
+
+  watch = QuestionWatch()
+  await watch.install(page)        # or a BrowserContext, before its pages navigate
+  question = await watch.get()     # {"text", "type", "options", "url"}
+"""
+import asyncio
+from typing import Dict, List, Optional, Set, Union
+
+from playwright.async_api import BrowserContext, Page
+
+BINDING_NAME = "__questionWatch"
+SETTLE_MS = 100
+
+_OBSERVER_JS = """
+(() => {
+    if (window.__questionWatchInstalled) return;
+    window.__questionWatchInstalled = true;
+    const reported = new WeakSet();
+    const SKIP = ["Tampilkan filter", "Sembunyikan", "Cari"];
+
+    const parse = (el) => {
+        const text = (el.innerText || "").replace(/\\*/g, "").trim();
+        if (text.length < 5 || SKIP.some(s => text.includes(s))) return null;
+        // Up to three levels from the label to the block holding the inputs
+        let wrapper = el.parentElement;
+        if (wrapper && wrapper.parentElement) wrapper = wrapper.parentElement;
+        if (wrapper && wrapper.parentElement) wrapper = wrapper.parentElement;
+        if (!wrapper) return {text, type: "Text", options: []};
+
+        const select = wrapper.querySelector("select");
+        if (select) {
+            const options = Array.from(select.options)
+                .map(o => o.innerText.trim())
+                .filter(t => t && !t.toLowerCase().includes("select") && !t.toLowerCase().includes("pilih"));
+            return {text, type: "Dropdown", options};
+        }
+        if (wrapper.querySelector("input[type='radio'], input[type='checkbox']")) {
+            const options = Array.from(wrapper.querySelectorAll("label"))
+                .map(l => l.innerText.trim())
+                .filter(Boolean);
+            return {text, type: "Choice", options};
+        }
+        return {text, type: "Text", options: []};
+    };
+
+    const scan = () => {
+        const scope = document.querySelector("form, div[role='dialog']") || document;
+        const found = [];
+        for (const el of scope.querySelectorAll("label, [elementtiming='Question Text']")) {
+            if (reported.has(el)) continue;
+            // Not marked until it parses: a label whose text, or a select whose options,
+            // render later is looked at again on the next mutation
+            const q = parse(el);
+            if (!q || (q.type === "Dropdown" && !q.options.length)) continue;
+            reported.add(el);
+            found.push(q);
+        }
+        if (found.length) window.%(binding)s(found);
+    };
+
+    let timer = null;
+    const schedule = () => {
+        if (timer !== null) clearTimeout(timer);
+        timer = setTimeout(() => { timer = null; scan(); }, %(settle)d);
+    };
+    const start = () => {
+        new MutationObserver(schedule)
+            .observe(document.documentElement, {childList: true, characterData: true, subtree: true});
+        schedule();
+    };
+    if (document.documentElement) start();
+    else document.addEventListener("DOMContentLoaded", start);
+})();
+""" % {"binding": BINDING_NAME, "settle": SETTLE_MS}
+
+
+class QuestionWatch:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.delivered: Set[str] = set()
+        self.batches = 0
+
+    async def install(self, target: Union[Page, BrowserContext]) -> None:
+        """Expose the binding and observe every document of a page or context, including the current ones."""
+        await target.expose_binding(BINDING_NAME, self._on_blocks)
+        await target.add_init_script(_OBSERVER_JS)
+        pages = target.pages if isinstance(target, BrowserContext) else [target]
+        for page in pages:
+            try:
+                await page.evaluate(_OBSERVER_JS)
+            except Exception:
+                pass  # Mid-navigation: the init script covers the next document
+
+    def _on_blocks(self, source: Dict, blocks: List[Dict]) -> None:
+        self.batches += 1
+        url = source["page"].url if source.get("page") else ""
+        for q in blocks:
+            if q["text"] in self.delivered:
+                continue
+            self.delivered.add(q["text"])
+            self.queue.put_nowait({**q, "url": url})
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next new question, or None if none rendered within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> List[Dict]:
+        """Every question queued so far, without waiting."""
+        questions = []
+        while not self.queue.empty():
+            questions.append(self.queue.get_nowait())
+        return questions
@@ -0,0 +1,165 @@
+"""
+Run Logger
+==========
+Streams a run to automaton/logs/<run_id>.jsonl, one JSON event per line, instead of
+holding everything in a dict that is dumped once at exit.
+
+Events: run_start (settings), job_seen, skipped, applied, parked (unknown questions,
+see pending_queue.py), stage (timing) and run_end (summary). Lines are buffered and flushed every FLUSH_EVERY events or FLUSH_INTERVAL
+seconds, and right away for applications, so a hard kill loses at most a few skip
+lines. A job skipped again for the same reason (recommendation refreshes show the
+same cards over and over) is counted but not written again.
+
+read_run_log() rebuilds the old <run_id>.json shape (settings, applied_jobs,
+skipped_jobs, summary, ...) from either format:
+
+  python automaton/run_logger.py automaton/logs/<run_id>.jsonl [out.json]
+"""
+import datetime
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+LOGS_DIR = "automaton/logs"
+FLUSH_EVERY = 50
+FLUSH_INTERVAL = 2.0
+
+
+class RunLogger:
+    def __init__(self, run_id: str, settings: Dict, logs_dir: str = LOGS_DIR,
+                 flush_every: int = FLUSH_EVERY, flush_interval: float = FLUSH_INTERVAL):
+        os.makedirs(logs_dir, exist_ok=True)
+        self.run_id = run_id
+        self.path = os.path.join(logs_dir, f"{run_id}.jsonl")
+        self.settings = settings
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.applied = 0
+        self.skipped = 0
+        self.repeat_skips = 0
+        self.skip_reasons: Counter = Counter()
+        self._seen: Set[str] = set()
+        self._skip_keys: Set[Tuple[str, str]] = set()
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._f = open(self.path, "a", encoding="utf-8")
+        self.event("run_start", run_id=run_id, settings=settings)
+
+    def event(self, kind: str, **data) -> None:
+        self._buffer.append(json.dumps({"t": round(time.time(), 3), "event": kind, **data}, ensure_ascii=False))
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._f.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._f.flush()
+        self._last_flush = time.monotonic()
+
+    def job_seen(self, job_id: str, title: str, url: str) -> None:
+        """First sighting of a job id in this run; later sightings are ignored."""
+        if job_id not in self._seen:
+            self._seen.add(job_id)
+            self.event("job_seen", job_id=job_id, title=title, url=url)
+
+    def skip(self, title: str, url: str, reason: str, keyword: str = "") -> None:
+        self.skipped += 1
+        self.skip_reasons[reason] += 1
+        key = (url, reason)
+        if key in self._skip_keys:
+            self.repeat_skips += 1
+            return
+        self._skip_keys.add(key)
+        self.event("skipped", title=title, url=url, reason=reason, keyword=keyword)
+
+    def apply(self, job_log: Dict) -> None:
+        self.applied += 1
+        self.event("applied", job=job_log)
+        self.flush()
+
+    def stage(self, stage: str, seconds: float, **data) -> None:
+        """One stage timing sample (StageTimer's sink)."""
+        self.event("stage", stage=stage, seconds=round(seconds, 3), **data)
+
+    def close(self, **extra) -> Dict:
+        """Write run_end with the summary (plus any extra sections, e.g. timings, network) and close the file."""
+        summary = {
+            "total_applied": self.applied,
+            "total_skipped": self.skipped,
+            "unique_skipped": len(self._skip_keys),
+            "repeat_skips": self.repeat_skips,
+            "jobs_seen": len(self._seen),
+            "skip_reasons": dict(self.skip_reasons),
+        }
+        self.event("run_end", end_time=datetime.datetime.now().isoformat(), summary=summary, **extra)
+        self.flush()
+        self._f.close()
+        return summary
+
+
+def read_run_log(path: str) -> Dict:
+    """
+    Any run log (.json or .jsonl) in the legacy shape: timestamp, settings, applied_jobs,
+    skipped_jobs, summary; plus parked_jobs (job_id, title, url, questions) from a .jsonl.
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    log: Dict = {
+        "timestamp": os.path.splitext(os.path.basename(path))[0],
+        "settings": {},
+        "applied_jobs": [],
+        "skipped_jobs": [],
+        "parked_jobs": [],
+        "summary": {},
+    }
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                ev = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a killed run
+            kind = ev.get("event")
+            if kind == "run_start":
+                log["timestamp"] = ev.get("run_id", log["timestamp"])
+                log["settings"] = ev.get("settings", {})
+            elif kind == "skipped":
+                log["skipped_jobs"].append({k: ev.get(k, "") for k in ("title", "url", "reason", "keyword")})
+            elif kind == "applied":
+                log["applied_jobs"].append(ev["job"])
+            elif kind == "parked":
+                log["parked_jobs"].append({k: ev.get(k) for k in ("job_id", "title", "url", "questions")})
+            elif kind == "run_end":
+                log["settings"]["end_time"] = ev.get("end_time")
+                log["summary"] = ev.get("summary", {})
+                for key, value in ev.items():
+                    if key not in ("t", "event", "end_time", "summary"):
+                        log[key] = value
+    if not log["summary"]:
+        # No run_end: the run was killed; count what made it to disk
+        log["summary"] = {"total_applied": len(log["applied_jobs"]), "total_skipped": len(log["skipped_jobs"])}
+    return log
+
+
+def run_log_paths(logs_dir: str = LOGS_DIR) -> List[str]:
+    """Every run log in logs_dir, old .json and new .jsonl, oldest first."""
+    return sorted(glob.glob(os.path.join(logs_dir, "*.json")) + glob.glob(os.path.join(logs_dir, "*.jsonl")))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python automaton/run_logger.py <run_log.jsonl> [out.json]")
+    else:
+        rebuilt = read_run_log(sys.argv[1])
+        if len(sys.argv) > 2:
+            with open(sys.argv[2], "w", encoding="utf-8") as f:
+                json.dump(rebuilt, f, indent=4, ensure_ascii=False)
+            print(f"Wrote {sys.argv[2]}")
+        else:
+            print(json.dumps(rebuilt, indent=4, ensure_ascii=False))
@@ -0,0 +1,66 @@
+"""
+Session Check
+=============
+Decides whether the saved JobStreet login is still good from cookies alone, so a run
+can skip the homepage login probe (page load, fixed wait, "Masuk" link count).
+
+After a login has been confirmed on a real page, the context's storage state is saved
+to SESSION_STATE_FILE. Its auth cookies (names matching AUTH_COOKIE_HINTS on a
+JobStreet/SEEK domain) are the reference: on the next start the session counts as
+valid when every one of them is still in the browser profile and none expires within
+EXPIRY_MARGIN_S. Anything else (no saved state, missing or expiring cookie) means
+the full login flow runs, and the state is saved again afterwards.
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+SESSION_STATE_FILE = "automaton/session_state.json"
+SESSION_DOMAINS = ("jobstreet.com", "seek.com")
+AUTH_COOKIE_HINTS = ("auth", "token", "session", "sol_id")
+EXPIRY_MARGIN_S = 600
+
+
+def auth_cookies(cookies: List[Dict]) -> Dict[str, Dict]:
+    """name → cookie for the login-related cookies of a context.cookies()/storage_state list."""
+    return {
+        c["name"]: c for c in cookies
+        if any(d in c.get("domain", "") for d in SESSION_DOMAINS)
+        and any(h in c["name"].lower() for h in AUTH_COOKIE_HINTS)
+    }
+
+
+def load_reference(path: str = SESSION_STATE_FILE) -> Optional[Dict[str, Dict]]:
+    """Auth cookies of the last confirmed login, or None if there is none on disk."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return auth_cookies(state.get("cookies", []))
+
+
+def check_session(cookies: List[Dict], reference: Optional[Dict[str, Dict]],
+                  now: Optional[float] = None, margin_s: float = EXPIRY_MARGIN_S) -> Tuple[bool, str]:
+    """(valid, why) for the context's current cookies against the last confirmed login."""
+    if not reference:
+        return False, "no confirmed login saved"
+    now = time.time() if now is None else now
+    current = auth_cookies(cookies)
+    expiries = []
+    for name in reference:
+        c = current.get(name)
+        if c is None:
+            return False, f"cookie {name} is gone"
+        expires = c.get("expires", -1)
+        if expires != -1:
+            if expires < now + margin_s:
+                return False, f"cookie {name} expired"
+            expiries.append(expires)
+    if not expiries:
+        return True, "session cookies present"
+    hours = (min(expiries) - now) / 3600
+    return True, f"auth cookies valid for {hours:.0f}h"
@@ -0,0 +1,124 @@
+"""
+Stage Timer
+===========
+Monotonic wall-time samples per pipeline stage (page load, settle waits, filling,
+button waits, prompts, ...), summarised as count/total/p50/p95/max at the end of a run.
+
+  with TIMER.stage("fill"):              # also works as `async with`
+      await fill_question_group(...)
+
+  @TIMER.timed("snapshot")
+  async def read_step(page): ...
+
+Stages marked human=True (prompts, manual login) are time spent waiting on the user;
+they are reported apart so automated throughput can be measured on its own. Stages
+nest, so an outer stage such as "apply" includes any prompt inside it.
+
+TIMER is the process-wide instance apply_jobs.py instruments; run() resets it per run
+and points its sink at the RunLogger so each sample is also streamed as an event.
+"""
+import functools
+import inspect
+import math
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from rich.table import Table
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class _Span:
+    def __init__(self, timer: "StageTimer", stage: str, human: bool, data: Dict):
+        self.timer, self.name, self.human, self.data = timer, stage, human, data
+
+    def __enter__(self):
+        self.t0 = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        # Recorded on errors and timeouts too: a failed wait still cost the time
+        self.timer.record(self.name, time.monotonic() - self.t0, self.human, **self.data)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc):
+        return self.__exit__(*exc)
+
+
+class StageTimer:
+    def __init__(self):
+        self.reset()
+
+    def reset(self, sink: Optional[Callable[..., None]] = None) -> None:
+        """Drop all samples. sink(stage, seconds, **data) is called for every new sample."""
+        self.samples: Dict[str, List[float]] = {}
+        self.human: Set[str] = set()
+        self.sink = sink
+
+    def record(self, stage: str, seconds: float, human: bool = False, **data) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+        if human:
+            self.human.add(stage)
+            data["human"] = True
+        if self.sink:
+            self.sink(stage, seconds, **data)
+
+    def stage(self, stage: str, human: bool = False, **data) -> _Span:
+        return _Span(self, stage, human, data)
+
+    def timed(self, stage: str, human: bool = False):
+        """Decorator form of stage() for sync or async functions."""
+        def decorator(fn):
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    with self.stage(stage, human):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage, human):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def human_seconds(self) -> float:
+        return sum(sum(self.samples[s]) for s in self.human)
+
+    def summary(self) -> Dict[str, Dict]:
+        out = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            out[stage] = {
+                "count": len(ordered),
+                "total_s": round(sum(ordered), 3),
+                "p50_s": round(percentile(ordered, 50), 3),
+                "p95_s": round(percentile(ordered, 95), 3),
+                "max_s": round(ordered[-1], 3),
+                "human": stage in self.human,
+            }
+        return out
+
+    def table(self, title: str = "Stage timings") -> Table:
+        table = Table(title=title)
+        table.add_column("stage")
+        for col in ("n", "total", "p50", "p95", "max"):
+            table.add_column(col, justify="right")
+        for stage, t in sorted(self.summary().items(), key=lambda kv: -kv[1]["total_s"]):
+            name = f"{stage} (human)" if t["human"] else stage
+            table.add_row(name, str(t["count"]), f"{t['total_s']:.1f}s",
+                          f"{t['p50_s']:.2f}s", f"{t['p95_s']:.2f}s", f"{t['max_s']:.2f}s")
+        return table
+
+
+TIMER = StageTimer()